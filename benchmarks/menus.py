@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the latency, query count and peak memory of every menu endpoint
+against synthetic page trees of increasing size.
+
+    python -m benchmarks.menus --sizes 100,1000,10000,100000 --output results.json
+
+Every endpoint is requested once with cold caches, followed by ``--repeat``
+requests with warm caches. Peak memory is measured in a separate warm request,
+as tracing allocations slows down the request considerably. Building the
+tree of 100,000 pages takes a while, pass smaller ``--sizes`` for a quick run.
+"""
+
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import django
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment
+
+from djangocms_restapi.menu import cache, fragments, index, resolver
+from djangocms_restapi.menu.urls import router
+
+from .pages import make_page_tree
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+
+SIZES = (100, 1000, 10000, 100000)
+
+
+def get_endpoints():
+    """
+    Returns the endpoints registered in ``djangocms_restapi.menu.urls``.
+    """
+    return [prefix for prefix, viewset, base_name in router.registry]
+
+
+def get_params(endpoint, pages):
+    """
+    Returns the query parameters to request ``endpoint`` with, where the
+    current page is the deepest page of the tree which has children.
+    """
+    current_page = [page for page in pages if page.numchild][-1] if len(pages) > 1 else pages[0]
+    params = {"current_page": current_page.get_absolute_url()}
+    if endpoint == "show-menu-below-id":
+        params["root_id"] = pages[1].reverse_id if len(pages) > 1 else ""
+    elif endpoint == "node":
+        params["id"] = pages[1].pk if len(pages) > 1 else pages[0].pk
+    elif endpoint == "batch":
+        params["menus"] = "menu:show-menu,breadcrumb:show-breadcrumb"
+    elif endpoint == "bulk":
+        params["pages"] = [page.get_absolute_url() for page in pages[-10:]]
+    return params
+
+
+def clear_caches():
+    for backend in caches.all():
+        backend.clear()
+    cache.invalidate()
+    resolver.invalidate()
+    index.invalidate()
+    fragments.fragment_cache.clear()
+
+
+def request(client, path, params):
+    """
+    Returns a ``(seconds, queries, bytes)`` tuple for a single request.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        start = time.time()
+        response = client.get(path, params, HTTP_ACCEPT="application/json")
+        duration = time.time() - start
+    assert response.status_code == 200, (path, response.status_code)
+    return duration, len(queries), len(response.content)
+
+
+def measure_memory(client, path, params):
+    """
+    Returns the peak memory in bytes allocated during a single request, or
+    ``None`` where ``tracemalloc`` is not available.
+    """
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        client.get(path, params, HTTP_ACCEPT="application/json")
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_endpoint(client, endpoint, pages, repeat):
+    path = reverse("%s-list" % endpoint)
+    params = get_params(endpoint, pages)
+
+    clear_caches()
+    cold, queries, size = request(client, path, params)
+    warm = sorted(request(client, path, params) for i in range(repeat))
+    return {
+        "endpoint": endpoint,
+        "cold_ms": cold * 1000,
+        "cold_queries": queries,
+        "warm_ms": warm[len(warm) // 2][0] * 1000,
+        "warm_min_ms": warm[0][0] * 1000,
+        "warm_queries": warm[len(warm) // 2][1],
+        "peak_memory": measure_memory(client, path, params),
+        "response_bytes": size,
+    }
+
+
+def run(sizes=SIZES, breadth=10, depth=None, languages=("en",), endpoints=None, repeat=5):
+    """
+    Returns a list of results, one for every endpoint and tree size.
+    """
+    endpoints = endpoints or get_endpoints()
+    results = []
+    with override_settings(LANGUAGE_CODE=languages[0], LANGUAGES=[(code, code) for code in languages]):
+        for size in sizes:
+            call_command("flush", interactive=False, verbosity=0)
+            start = time.time()
+            pages = make_page_tree(size, breadth=breadth, depth=depth, languages=languages)
+            print("Created %d pages in %.1fs" % (len(pages), time.time() - start), file=sys.stderr)
+
+            client = Client()
+            for endpoint in endpoints:
+                result = benchmark_endpoint(client, endpoint, pages, repeat)
+                result.update({
+                    "pages": len(pages),
+                    "breadth": breadth,
+                    "depth": max(page.depth for page in pages) - 1,
+                    "languages": len(languages),
+                })
+                results.append(result)
+                print("%8d %-20s %10.1f %10.1f %8d %8d %12s" % (
+                    result["pages"], endpoint, result["cold_ms"], result["warm_ms"], result["cold_queries"],
+                    result["warm_queries"], result["peak_memory"]
+                ))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="Comma separated numbers of pages in each tree.")
+    parser.add_argument("--breadth", type=int, default=10, help="Maximum number of children of every page.")
+    parser.add_argument("--depth", type=int, default=None, help="Maximum depth of the tree below the home page.")
+    parser.add_argument("--languages", default="en", help="Comma separated languages of every page.")
+    parser.add_argument("--endpoint", action="append", dest="endpoints",
+                        help="Only benchmark the given endpoint. May be given more than once.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of warm requests for every endpoint.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+
+    print("%8s %-20s %10s %10s %8s %8s %12s" % (
+        "pages", "endpoint", "cold (ms)", "warm (ms)", "cold q", "warm q", "peak memory"
+    ))
+    results = run(
+        sizes=[int(size) for size in args.sizes.split(",")], breadth=args.breadth, depth=args.depth,
+        languages=args.languages.split(","), endpoints=args.endpoints, repeat=args.repeat
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "timestamp": int(time.time()),
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
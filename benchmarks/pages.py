@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from collections import deque
+
+from django.contrib.sites.models import Site
+from django.utils import timezone
+
+from cms.models import Page, Title
+
+
+def make_page_tree(size, breadth=10, depth=None, languages=("en",), reverse_id="benchmark"):
+    """
+    Creates a published tree of up to ``size`` pages below a single home page,
+    translated into every one of ``languages``.
+
+    The tree is filled breadth first, where every page has up to ``breadth``
+    children and no page is nested deeper than ``depth`` levels below the home
+    page. The pages are bulk inserted as public pages only, bypassing the
+    publishing machinery, so even trees of 100k pages can be created in a
+    reasonable time.
+
+    Returns the created pages in tree order. The first child of the home page
+    is given ``reverse_id``.
+    """
+    site = Site.objects.get_current()
+    now = timezone.now()
+    next_id = (Page.objects.order_by("-pk").values_list("pk", flat=True).first() or 0) + 1
+    last_root = Page.get_last_root_node()
+    root_step = Page._str2int(last_root.path[:Page.steplen]) + 1 if last_root else 1
+
+    pages = []
+    slugs = {}
+    queue = deque()
+
+    def add_page(parent, step):
+        page = Page(
+            pk=next_id + len(pages), parent=parent, site=site, template="nav_playground.html",
+            publisher_is_draft=False, in_navigation=True, is_home=parent is None,
+            languages=",".join(languages), creation_date=now, changed_date=now, publication_date=now,
+            path=Page._get_path(parent.path if parent else None, parent.depth + 1 if parent else 1, step),
+            depth=parent.depth + 1 if parent else 1, numchild=0,
+        )
+        if parent is not None:
+            parent.numchild += 1
+            slug = "page-%s" % page.pk
+            # Children of the home page don't include its slug in their paths.
+            slugs[page.pk] = (slug, "/".join(filter(None, [slugs[parent.pk][1] if not parent.is_home else "", slug])))
+        else:
+            slugs[page.pk] = ("home", "")
+        pages.append(page)
+        if depth is None or page.depth <= depth:
+            queue.append(page)
+        return page
+
+    add_page(None, root_step)
+    while queue and len(pages) < size:
+        parent = queue.popleft()
+        for step in range(1, breadth + 1):
+            if len(pages) >= size:
+                break
+            add_page(parent, step)
+
+    if len(pages) > 1:
+        pages[1].reverse_id = reverse_id
+
+    Page.objects.bulk_create(pages, batch_size=500)
+    Title.objects.bulk_create([
+        Title(
+            page_id=page.pk, language=language, title="Page %s (%s)" % (page.pk, language),
+            slug=slugs[page.pk][0], path=slugs[page.pk][1], published=True, publisher_is_draft=False,
+            creation_date=now
+        )
+        for page in pages
+        for language in languages
+    ], batch_size=500)
+    return sorted(pages, key=lambda page: page.path)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the REST framework and the fast node serializers.
+
+    python -m benchmarks.serializers
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import timeit
+
+from djangocms_restapi.menu.serializers import FastNavigationNodeSerializer, NavigationNodeSerializer
+
+from .trees import make_node_tree
+
+
+SIZES = (100, 1000, 10000)
+
+
+def measure(serializer_class, nodes, repeat=3):
+    """
+    Returns the best time in seconds out of ``repeat`` serializations of ``nodes``.
+    """
+    return min(timeit.repeat(lambda: serializer_class(nodes, many=True).data, number=1, repeat=repeat))
+
+
+def main():
+    print("%8s %18s %10s %8s" % ("nodes", "rest_framework (s)", "fast (s)", "speedup"))
+    for size in SIZES:
+        nodes = make_node_tree(size)
+        assert FastNavigationNodeSerializer(nodes, many=True).data == NavigationNodeSerializer(nodes, many=True).data
+        slow = measure(NavigationNodeSerializer, nodes)
+        fast = measure(FastNavigationNodeSerializer, nodes)
+        print("%8d %18.4f %10.4f %7.1fx" % (size, slow, fast, slow / fast))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from menus.base import NavigationNode
+
+
+def make_node_tree(size, breadth=10):
+    """
+    Returns the root nodes of a tree of ``size`` marked ``NavigationNodes``,
+    where every node has up to ``breadth`` children.
+    """
+    roots = []
+    parents = []
+    for i in range(size):
+        parent = parents[(i - breadth) // breadth] if i >= breadth else None
+        attr = {
+            "auth_required": False,
+            "is_home": i == 0,
+            "redirect_url": None,
+            "reverse_id": None,
+            "soft_root": False,
+            "visible_for_anonymous": True,
+            "visible_for_authenticated": True,
+        }
+        node = NavigationNode("Page %s" % i, "/page-%s/" % i, i + 1, getattr(parent, "id", None), attr=attr)
+        node.namespace = "CMSMenu"
+        node.parent_namespace = "CMSMenu" if parent else None
+        node.selected = i == 0
+        node.ancestor = node.descendant = node.sibling = False
+        node.parent = parent
+        if parent is None:
+            roots.append(node)
+        else:
+            parent.children.append(node)
+        parents.append(node)
+    return roots
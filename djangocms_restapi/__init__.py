@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+default_app_config = "djangocms_restapi.apps.RestAPIConfig"
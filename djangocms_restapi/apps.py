@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from django.apps import AppConfig
+
+
+class RestAPIConfig(AppConfig):
+    name = "djangocms_restapi"
+    verbose_name = "django CMS REST API"
+
+    def ready(self):
+        from .menu import receivers  # noqa
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from django.conf import settings
+
+
+DEFAULTS = {
+    # Maximum number of compiled menu tag templates kept in memory.
+    "MENU_TEMPLATE_CACHE_SIZE": 128,
+    # How the menu viewsets build their nodes. Either "template", which renders
+    # the ``menu_tags`` template tags, or "direct", which calls the menu pool
+    # without rendering any templates.
+    "MENU_BACKEND": "template",
+    # How the menu viewsets serialize their nodes. Either "rest_framework", which
+    # uses the REST framework serializers, or "fast", which produces the same
+    # output from hand written serializers.
+    "MENU_SERIALIZER": "rest_framework",
+    # Whether JSON menu responses are spliced together from pre-encoded
+    # fragments of the nodes, instead of being serialized and rendered.
+    "MENU_FRAGMENTS": False,
+    # Maximum number of pages whose encoded fragments are kept in memory.
+    "MENU_FRAGMENT_CACHE_SIZE": 10000,
+    # Number of seconds the encoded fragments of a page are kept. Fragments are
+    # also dropped whenever a page is published, unpublished, moved or deleted.
+    "MENU_FRAGMENT_TIMEOUT": 5 * 60,
+    # Whether the menu viewsets report the number of SQL queries and the time
+    # spent in each phase in a Server-Timing header and in the log.
+    "MENU_TIMING": False,
+    # Whether the pages resolved from ``current_page`` are cached in memory.
+    "PAGE_RESOLVER": False,
+    # Maximum number of resolved pages kept in memory.
+    "PAGE_RESOLVER_CACHE_SIZE": 1000,
+    # Number of seconds a resolved page is kept. Resolved pages are also dropped
+    # whenever a page is published, unpublished, moved or deleted.
+    "PAGE_RESOLVER_TIMEOUT": 5 * 60,
+    # Alias of the cache used for menu responses, or None to disable
+    # response caching.
+    "MENU_CACHE": None,
+    # Number of seconds a menu response is cached for. Cached responses are
+    # also invalidated whenever a page is published, unpublished, moved or deleted.
+    "MENU_CACHE_TIMEOUT": 60 * 60,
+    # Encodings of the precompressed variants stored with cached JSON menu
+    # responses, in order of preference. Brotli ("br") is left out when the
+    # ``brotli`` module isn't installed.
+    "MENU_CACHE_ENCODINGS": ("br", "gzip"),
+    # Whether the menu viewsets send ETag headers, and answer conditional requests
+    # with 304 Not Modified.
+    "MENU_CONDITIONAL_GET": False,
+    # Whether menu responses carry their content version in an X-Menu-Version
+    # header, and ``since=<version>`` returns the changes since that version.
+    "MENU_VERSIONS": False,
+    # Maximum number of menu versions kept in memory when no menu cache is
+    # configured. With a menu cache, the versions are kept in the cache.
+    "MENU_VERSION_CACHE_SIZE": 100,
+    # Maximum number of node indexes, used by the node endpoint, kept in memory.
+    # An index is kept per site, language and visibility for every version of
+    # the page tree.
+    "NODE_INDEX_CACHE_SIZE": 32,
+    # Maximum number of node trees kept in memory for authenticated users when
+    # ``CMS_PERMISSION`` is enabled. The trees are shared by every user of the
+    # same permission class.
+    "MENU_TREE_CACHE_SIZE": 32,
+    # Maximum number of users whose permission class is kept in memory.
+    "PERMISSION_CLASS_CACHE_SIZE": 10000,
+    # Number of seconds the permission class of a user is kept. Permission classes
+    # are also dropped whenever page permissions change, and whenever group
+    # memberships change in the same process.
+    "PERMISSION_CLASS_TIMEOUT": 60,
+    # Whether the cached menus of a published page, its ancestors and its siblings
+    # are rebuilt in the background once the publish is committed. Requires
+    # ``MENU_CACHE``. Before Django 1.9, pages published inside a transaction are
+    # only warmed once the request publishing them has finished. Only the menus
+    # of anonymous users are warmed, so authenticated users, who are cached per
+    # visibility, still build their menus after every publish.
+    "MENU_CACHE_WARMING": False,
+    # The ``(endpoint, query parameters)`` pairs of the menus warmed for each page,
+    # e.g. ``("show-menu", {"extra_inactive": 100})``. The query parameters must be
+    # the ones the clients use, since they're part of the cache key.
+    "MENU_CACHE_WARMING_MENUS": (("show-menu", {}), ("show-breadcrumb", {})),
+    # Number of background threads warming the cached menus.
+    "MENU_CACHE_WARMING_WORKERS": 2,
+    # Whether the cached menus are warmed right away in the publishing thread
+    # instead, e.g. for tests.
+    "MENU_CACHE_WARMING_SYNC": False,
+    # Content types of the responses ``CurrentPageCookieMiddleWare`` remembers
+    # the current page for.
+    "CURRENT_PAGE_COOKIE_CONTENT_TYPES": ("text/html",),
+    # Regular expressions matching the paths ``CurrentPageCookieMiddleWare``
+    # never looks up the current page for, e.g. ``r"^/admin/"``.
+    "CURRENT_PAGE_COOKIE_EXCLUDED_PATHS": (),
+}
+
+
+def get_setting(name):
+    """
+    Returns the value of the ``DJANGOCMS_RESTAPI_<name>`` setting,
+    falling back to the default value when it's not configured.
+    """
+    return getattr(settings, "DJANGOCMS_RESTAPI_%s" % name, DEFAULTS[name])
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from optparse import make_option
+
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+
+from ...menu.export import ENDPOINTS, export_menus
+
+
+class Command(BaseCommand):
+    args = "<output directory>"
+    help = (
+        "Writes the output of the menu endpoints for every published page, language and site "
+        "to <output directory>/<site>/<language>/<endpoint>/<page path>/index.json."
+    )
+    option_list = BaseCommand.option_list + (
+        make_option("--workers", type="int", default=1,
+                    help="Number of worker processes. Defaults to 1."),
+        make_option("--gzip", action="store_true", default=False,
+                    help="Also write gzip compressed copies of the files."),
+        make_option("--site", action="append", type="int", dest="sites",
+                    help="Only export the site with this id. May be repeated."),
+        make_option("--endpoint", action="append", dest="endpoints",
+                    help="Only export this endpoint. May be repeated."),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 1:
+            raise CommandError("Usage: export_menus %s" % self.args)
+
+        endpoints = options.get("endpoints") or ENDPOINTS
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError("Unknown endpoints: %s" % ", ".join(sorted(unknown)))
+
+        site_ids = options.get("sites") or Site.objects.values_list("pk", flat=True)
+        count = export_menus(args[0], list(site_ids), workers=options.get("workers") or 1,
+                             compress=options.get("gzip"), endpoints=endpoints)
+        self.stdout.write("Exported %d menus." % count)
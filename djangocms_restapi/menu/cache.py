@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import time
+
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import caches
+from django.utils import six, translation
+
+from ..conf import get_setting
+
+
+GENERATION_KEY = "djangocms_restapi:menu:generation"
+KEY_PREFIX = "djangocms_restapi:menu"
+
+
+def get_cache():
+    """
+    Returns the cache used for menu responses, or ``None`` when
+    response caching is disabled.
+    """
+    alias = get_setting("MENU_CACHE")
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+def get_generation(cache):
+    """
+    Returns the current cache generation. Every key contains the generation,
+    so bumping it invalidates all the cached menu responses at once.
+    """
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Start from a timestamp rather than 1, so a generation key which has
+        # been evicted never brings stale entries back to life.
+        cache.add(GENERATION_KEY, int(time.time() * 1000), None)
+        generation = cache.get(GENERATION_KEY, 0)
+    return generation
+
+
+def invalidate():
+    """
+    Invalidates all the cached menu responses.
+    """
+    cache = get_cache()
+    if cache is None:
+        return
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        get_generation(cache)
+
+
+def get_visibility(request):
+    """
+    Returns the visibility class of the user making the request. When the
+    pages visible to authenticated users depend on their permissions, the
+    users are partitioned further by their permission class.
+    """
+    # Imported here, since the permission classes are kept per cache generation.
+    from .permissions import get_permission_class, is_partitioned
+
+    if not request.user.is_authenticated():
+        return "anonymous"
+    if is_partitioned(request):
+        return "authenticated:%s" % get_permission_class(request)
+    return "authenticated"
+
+
+def normalize_params(params):
+    """
+    Returns the query parameters as a sorted list of ``(key, values)`` pairs.
+    """
+    return sorted((key, sorted(values)) for key, values in params.lists())
+
+
+def make_key(cache, endpoint, params, media_type, request):
+    """
+    Returns the cache key for a menu response. ``params`` are the query
+    parameters of the API request, ``media_type`` is its accepted media type
+    and ``request`` is the request clone which has been run through the
+    ``CurrentPageMiddleware``.
+    """
+    page = request.current_page
+    parts = (
+        endpoint,
+        normalize_params(params),
+        media_type,
+        getattr(page, "pk", None),
+        translation.get_language(),
+        get_current_site(request).pk,
+        get_visibility(request),
+    )
+    return digest_key(cache, parts)
+
+
+def make_node_key(cache, endpoint, params, media_type, tree_key):
+    """
+    Returns the cache key for a response of the node endpoint. The node
+    endpoint doesn't depend on the current page but on the node tree, so
+    it's keyed on the ``tree_key`` of the request instead, which saves
+    resolving the current page.
+    """
+    return digest_key(cache, (endpoint, normalize_params(params), media_type, tree_key))
+
+
+def digest_key(cache, parts):
+    digest = hashlib.md5(six.text_type(parts).encode("utf-8")).hexdigest()
+    return "%s:%s:%s" % (KEY_PREFIX, get_generation(cache), digest)
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+A compact columnar format for serialized menus. Every list of nodes is
+packed into a table::
+
+    {
+        "fields": ["id", "title", ..., ["attrs", ["auth_required", ...]], "children"],
+        "interned": ["namespace", "parent_namespace", ...],
+        "strings": ["CMSMenu", ...],
+        "rows": [[1, "Home", ..., [false, ...], 2], ...]
+    }
+
+The nodes are listed in pre-order, with the number of children in place of
+the children of a node. Fields holding a dict, like ``attrs``, are packed
+into a row of their own. In the ``interned`` fields, integers refer to the
+``strings`` table, which holds every string that occurs more than once. An
+empty object stands for a field a node doesn't have.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+from collections import Counter, OrderedDict
+
+from django.utils import six
+
+
+CHILDREN = "children"
+
+MISSING = object()
+
+
+def is_scalar(value):
+    return value is None or isinstance(value, (six.string_types, six.integer_types, float))
+
+
+def is_row(value):
+    """
+    Returns ``True`` if ``value`` is a serialized node.
+    """
+    if not isinstance(value, dict):
+        return False
+    for name, field in value.items():
+        if name == CHILDREN and isinstance(field, list):
+            continue
+        if isinstance(field, dict):
+            if not all(is_scalar(nested) for nested in field.values()):
+                return False
+        elif not is_scalar(field):
+            return False
+    return True
+
+
+def is_table(value):
+    """
+    Returns ``True`` if ``value`` is a list of serialized nodes.
+    """
+    return isinstance(value, list) and bool(value) and all(is_row(item) for item in value)
+
+
+def walk(nodes):
+    """
+    Returns the serialized ``nodes`` and their descendants in pre-order.
+    """
+    ret = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        ret.append(node)
+        children = node.get(CHILDREN)
+        if isinstance(children, list):
+            stack.extend(reversed(children))
+    return ret
+
+
+def pack_nodes(nodes):
+    """
+    Returns the table of the serialized ``nodes``.
+    """
+    rows = walk(nodes)
+
+    # The fields and their nested fields, in the order they first occur.
+    fields = OrderedDict()
+    for row in rows:
+        for name, value in row.items():
+            if name not in fields:
+                fields[name] = None
+            if isinstance(value, dict):
+                if fields[name] is None:
+                    fields[name] = OrderedDict()
+                fields[name].update((key, None) for key in value)
+
+    columns = OrderedDict()
+    for row in rows:
+        for name, value in row.items():
+            if isinstance(value, dict):
+                for key, nested_value in value.items():
+                    columns.setdefault("%s.%s" % (name, key), []).append(nested_value)
+            elif name != CHILDREN:
+                columns.setdefault(name, []).append(value)
+
+    # Only fields holding nothing but strings are interned, so integers
+    # can refer to the string table unambiguously.
+    interned = [
+        column for column, values in columns.items()
+        if all(value is None or isinstance(value, six.string_types) for value in values) and any(values)
+    ]
+    counts = Counter(
+        value for column in interned for value in columns[column] if isinstance(value, six.string_types)
+    )
+    strings = sorted((value for value, count in counts.items() if count > 1), key=lambda value: -counts[value])
+    indexes = dict((value, index) for index, value in enumerate(strings))
+    interned_set = set(interned)
+
+    def pack_value(column, value):
+        if column in interned_set and isinstance(value, six.string_types):
+            return indexes.get(value, value)
+        return value
+
+    packed_rows = []
+    for row in rows:
+        packed_row = []
+        for name, nested in fields.items():
+            value = row.get(name, MISSING)
+            if value is MISSING:
+                packed_row.append({})
+            elif name == CHILDREN and isinstance(value, list):
+                packed_row.append(len(value))
+            elif isinstance(value, dict):
+                packed_row.append([
+                    pack_value("%s.%s" % (name, key), value[key]) if key in value else {} for key in nested
+                ])
+            else:
+                packed_row.append(pack_value(name, value))
+        packed_rows.append(packed_row)
+
+    return OrderedDict((
+        ("fields", [name if nested is None else [name, list(nested)] for name, nested in fields.items()]),
+        ("interned", interned),
+        ("strings", strings),
+        ("rows", packed_rows),
+    ))
+
+
+def unpack_nodes(table):
+    """
+    Returns the serialized nodes packed into ``table``.
+    """
+    strings = table["strings"]
+    interned = set(table["interned"])
+
+    def is_integer(value):
+        return isinstance(value, six.integer_types) and not isinstance(value, bool)
+
+    def unpack_value(column, value):
+        if column in interned and is_integer(value):
+            return strings[value]
+        return value
+
+    fields = [(field, None) if isinstance(field, six.string_types) else tuple(field) for field in table["fields"]]
+    roots = []
+    # The lists of children being filled, with the number of nodes still missing.
+    stack = []
+    for row in table["rows"]:
+        node = OrderedDict()
+        count = 0
+        for (name, nested), value in zip(fields, row):
+            if value == {}:
+                continue
+            elif name == CHILDREN and is_integer(value):
+                node[name] = []
+                count = value
+            elif nested is not None and isinstance(value, list):
+                node[name] = OrderedDict(
+                    (key, unpack_value("%s.%s" % (name, key), nested_value))
+                    for key, nested_value in zip(nested, value) if nested_value != {}
+                )
+            else:
+                node[name] = unpack_value(name, value)
+
+        if stack:
+            children = stack[-1]
+            children[0].append(node)
+            children[1] -= 1
+            if not children[1]:
+                stack.pop()
+        else:
+            roots.append(node)
+
+        if count:
+            stack.append([node[CHILDREN], count])
+    return roots
+
+
+def pack(data):
+    """
+    Returns ``data`` with every list of serialized nodes packed into a table.
+    """
+    if is_table(data):
+        return pack_nodes(data)
+    elif isinstance(data, dict):
+        return OrderedDict((name, pack(value)) for name, value in data.items())
+    elif isinstance(data, list):
+        return [pack(item) for item in data]
+    return data
+
+
+def unpack(data):
+    """
+    Returns ``data`` with every table unpacked into a list of serialized nodes.
+    """
+    if isinstance(data, dict):
+        if "fields" in data and "rows" in data and "strings" in data:
+            return unpack_nodes(data)
+        return OrderedDict((name, unpack(value)) for name, value in data.items())
+    elif isinstance(data, list):
+        return [unpack(item) for item in data]
+    return data
+
+
+def decode(content):
+    """
+    Decodes a response rendered by ``CompactMenuRenderer`` back into the
+    data of the regular JSON response.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+    return unpack(json.loads(content, object_pairs_hook=OrderedDict))
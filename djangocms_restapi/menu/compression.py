@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import gzip
+import io
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+IDENTITY = "identity"
+
+# Responses smaller than this aren't worth compressing, just like in
+# ``django.middleware.gzip``.
+MINIMUM_SIZE = 200
+
+
+def compress_gzip(content):
+    buf = io.BytesIO()
+    with gzip.GzipFile(mode="wb", compresslevel=6, fileobj=buf, mtime=0) as f:
+        f.write(content)
+    return buf.getvalue()
+
+
+def compress_brotli(content):
+    return brotli.compress(content)
+
+
+COMPRESSORS = {
+    "gzip": compress_gzip,
+    "br": compress_brotli,
+}
+
+
+def get_available_encodings(encodings):
+    """
+    Returns the ``encodings`` which can be produced, leaving out brotli
+    when the ``brotli`` module isn't installed.
+    """
+    return [encoding for encoding in encodings if encoding in COMPRESSORS and (encoding != "br" or brotli)]
+
+
+def compress(content, encodings):
+    """
+    Returns a dict with ``content`` and its variants compressed with each of
+    the available ``encodings``, keyed by the name of the encoding. Variants
+    which aren't smaller than the content are left out.
+    """
+    variants = {IDENTITY: content}
+    if len(content) < MINIMUM_SIZE:
+        return variants
+    for encoding in get_available_encodings(encodings):
+        compressed = COMPRESSORS[encoding](content)
+        if len(compressed) < len(content):
+            variants[encoding] = compressed
+    return variants
+
+
+def parse_accept_encoding(header):
+    """
+    Returns a dict of the quality of each encoding in an ``Accept-Encoding``
+    header.
+    """
+    qualities = {}
+    for part in header.split(","):
+        encoding, _, params = part.partition(";")
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[encoding] = quality
+    return qualities
+
+
+def choose_encoding(request, variants, preference=("br", "gzip")):
+    """
+    Returns the name of the variant to send for ``request``, preferring the
+    encodings in the order of ``preference`` when the client accepts several.
+    """
+    qualities = parse_accept_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    accepted = [
+        encoding for encoding in preference
+        if encoding in variants and qualities.get(encoding, qualities.get("*", 0)) > 0
+    ]
+    if not accepted:
+        return IDENTITY
+    return max(accepted, key=lambda encoding: qualities.get(encoding, qualities.get("*", 0)))
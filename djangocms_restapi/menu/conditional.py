@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import calendar
+import hashlib
+
+from django.contrib.sites.shortcuts import get_current_site
+from django.db.models import Count, Max
+from django.utils import six, translation
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+
+from cms.models import Page
+
+from ..conf import get_setting
+from .cache import get_cache, get_generation, get_visibility, normalize_params
+
+
+def get_tree_state(site_id):
+    """
+    Returns the time of the newest change to a public page on the site as
+    seconds since the epoch (or ``None`` if there are no pages), together
+    with the number of public pages, so deleted pages are noticed as well.
+    """
+    state = Page.objects.public().filter(site_id=site_id).aggregate(
+        last_modified=Max("changed_date"), count=Count("pk")
+    )
+    last_modified = state["last_modified"]
+    if last_modified is not None:
+        last_modified = calendar.timegm(last_modified.utctimetuple())
+    return last_modified, state["count"]
+
+
+def get_request_tree_state(request):
+    """
+    Returns the ``get_tree_state`` of the current site of ``request``, which
+    is looked up only once per request.
+    """
+    state = getattr(request, "_tree_state", None)
+    if state is None:
+        state = request._tree_state = get_tree_state(get_current_site(request).pk)
+    return state
+
+
+def get_tree_key(request):
+    """
+    Returns a key for the node tree visible to ``request``, which changes
+    whenever the page tree changes. With a menu cache, the key also changes
+    whenever the cache generation is bumped, e.g. by permission changes in
+    other processes.
+    """
+    key = (
+        get_current_site(request).pk, translation.get_language(), get_visibility(request),
+        get_request_tree_state(request),
+    )
+    cache = get_cache()
+    if cache is not None:
+        key += (get_generation(cache),)
+    return key
+
+
+def get_validators(endpoint, params, request):
+    """
+    Returns a ``(etag, last_modified)`` tuple for a menu response without
+    building the menu. ``request`` is the API request, whose accepted
+    renderer must already have been negotiated. ``last_modified`` is the
+    time of the newest change to a public page, which doesn't move when
+    pages are deleted, so the entity tag is the more reliable validator.
+    """
+    site_id = get_current_site(request).pk
+    last_modified, count = get_request_tree_state(request)
+    parts = (
+        endpoint,
+        normalize_params(params),
+        request.accepted_media_type,
+        translation.get_language(),
+        site_id,
+        get_visibility(request),
+        last_modified,
+        count,
+    )
+    etag = hashlib.md5(six.text_type(parts).encode("utf-8")).hexdigest()
+    return etag, last_modified
+
+
+def is_not_modified(request, etag, last_modified):
+    """
+    Returns ``True`` if the client's cached copy, as described by the
+    ``If-None-Match`` or ``If-Modified-Since`` headers, is still fresh.
+    ``If-None-Match`` takes precedence when both are sent. The tags of the
+    encoded variants set by ``set_validators`` match as well.
+    """
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        fresh = set("%s-%s" % (etag, encoding) for encoding in get_setting("MENU_CACHE_ENCODINGS"))
+        fresh.update(("*", etag))
+        return not fresh.isdisjoint(parse_etags(if_none_match))
+
+    if_modified_since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE"))
+    if if_modified_since is not None and last_modified is not None:
+        return last_modified <= if_modified_since
+    return False
+
+
+def set_validators(response, etag, last_modified, encoding=None):
+    """
+    Sets the ``ETag``, ``Last-Modified`` and ``Vary`` headers on
+    ``response``. The content coding, which defaults to the one of
+    ``response``, is appended to the tag of encoded responses, since a
+    strong tag must differ between the bytes of each variant.
+    """
+    encoding = encoding or response.get("Content-Encoding")
+    if encoding:
+        etag = "%s-%s" % (etag, encoding)
+    response["ETag"] = quote_etag(etag)
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_vary_headers(response, ("Accept", "Cookie"))
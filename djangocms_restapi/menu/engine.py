@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from django.contrib.sites.models import Site
+from django.core.urlresolvers import reverse
+from django.utils.six.moves.urllib.parse import unquote
+
+from menus.menu_pool import menu_pool
+from menus.templatetags.menu_tags import cut_after, cut_levels, flatten
+
+from ..conf import get_setting
+from ..utils import LRUCache
+from .conditional import get_tree_key
+from .nodes import compact_nodes, copy_nodes
+from .permissions import is_partitioned
+
+
+# Node trees shared by the users of the same permission class, keyed by the
+# site, language, visibility and version of the tree.
+tree_cache = LRUCache(maxsize=get_setting("MENU_TREE_CACHE_SIZE"))
+
+# The modules of the modifiers known to only set the attributes ``CompactNode`` keeps.
+COMPACT_MODIFIER_MODULES = ("menus.modifiers", "cms.menu", "cms.cms_menus")
+
+
+def use_compact_nodes():
+    """
+    Returns ``True`` if the node trees may be kept as ``CompactNodes``, which
+    is when every registered modifier is one of django CMS'. Other modifiers
+    may set attributes of their own on the nodes.
+    """
+    return all(modifier.__module__ in COMPACT_MODIFIER_MODULES for modifier in menu_pool.modifiers)
+
+
+def build_tree(request, site_id):
+    nodes = menu_pool._build_nodes(request, site_id)
+    return compact_nodes(nodes) if use_compact_nodes() else nodes
+
+
+def build_nodes(request, site_id):
+    """
+    Returns the node tree built by the menu pool, as ``CompactNodes`` where
+    possible. django CMS caches the trees of authenticated users per user, so
+    when the visible pages depend on the permissions of the users, the trees
+    are shared in memory by every user of the same permission class instead.
+    """
+    if not is_partitioned(request):
+        return build_tree(request, site_id)
+    return tree_cache.get_or_set(get_tree_key(request), lambda: build_tree(request, site_id))
+
+
+def get_nodes(request, namespace=None, root_id=None, breadcrumb=False):
+    """
+    Mirrors ``menu_pool.get_nodes``, except that the node tree is built only
+    once per request. The modifiers mark the nodes by setting attributes on
+    them, and ``cut_levels`` and ``cut_after`` unlink them, so every call
+    marks its own copy of the tree. Neither the tree of the request nor the
+    shared trees are ever modified.
+    """
+    nodes = getattr(request, "_menu_nodes", None)
+    if nodes is None:
+        menu_pool.discover_menus()
+        nodes = request._menu_nodes = build_nodes(request, Site.objects.get_current().pk)
+    nodes = copy_nodes(nodes)
+    return menu_pool.apply_modifiers(nodes, request, namespace, root_id, post_cut=False, breadcrumb=breadcrumb)
+
+
+def show_menu(request, from_level=0, to_level=100, extra_inactive=0, extra_active=1000,
+              template=None, namespace=None, root_id=None):
+    """
+    Mirrors the ``{% show_menu %}`` template tag.
+    """
+    nodes = get_nodes(request, namespace, root_id)
+    if root_id:
+        id_nodes = menu_pool.get_nodes_by_attribute(nodes, "reverse_id", root_id)
+        if id_nodes:
+            node = id_nodes[0]
+            nodes = node.children
+            for remove_parent in nodes:
+                remove_parent.parent = None
+            from_level += node.level + 1
+            to_level += node.level + 1
+            nodes = flatten(nodes)
+        else:
+            nodes = []
+    children = cut_levels(nodes, from_level, to_level, extra_inactive, extra_active)
+    children = menu_pool.apply_modifiers(children, request, namespace, root_id, post_cut=True)
+    return {"children": children}
+
+
+def show_menu_below_id(request, root_id=None, from_level=0, to_level=100, extra_inactive=0,
+                       extra_active=1000, template=None, namespace=None):
+    """
+    Mirrors the ``{% show_menu_below_id %}`` template tag.
+    """
+    return show_menu(request, from_level, to_level, extra_inactive, extra_active,
+                     template, namespace, root_id)
+
+
+def show_sub_menu(request, levels=100, root_level=None, nephews=100, template=None):
+    """
+    Mirrors the ``{% show_sub_menu %}`` template tag.
+    """
+    nodes = get_nodes(request)
+    children = []
+    include_root = False
+    # Adjust root_level so we cut before the specified level, not after.
+    if root_level is not None and root_level > 0:
+        root_level -= 1
+    elif root_level is not None and root_level == 0:
+        include_root = True
+    for node in nodes:
+        if root_level is None and node.selected:
+            root_level = node.level
+        is_root_ancestor = node.ancestor and node.level == root_level
+        root_selected = node.selected and node.level == root_level
+        if is_root_ancestor or root_selected:
+            cut_after(node, levels, [])
+            children = node.children
+            for child in children:
+                if child.sibling:
+                    cut_after(child, nephews, [])
+            if include_root:
+                children = menu_pool.apply_modifiers([node], request, post_cut=True)
+            else:
+                children = menu_pool.apply_modifiers(children, request, post_cut=True)
+    return {"children": children}
+
+
+def show_breadcrumb(request, start_level=0, template=None, only_visible=True):
+    """
+    Mirrors the ``{% show_breadcrumb %}`` template tag.
+    """
+    ancestors = []
+    nodes = get_nodes(request, breadcrumb=True)
+
+    root_url = unquote(reverse("pages-root"))
+    home = next((node for node in nodes if node.get_absolute_url() == root_url), None)
+    selected = next((node for node in nodes if node.selected), None)
+
+    if selected and selected != home:
+        node = selected
+        while node:
+            if node.visible or not only_visible:
+                ancestors.append(node)
+            node = node.parent
+    if not ancestors or (ancestors and ancestors[-1] != home) and home:
+        ancestors.append(home)
+    ancestors.reverse()
+    if len(ancestors) >= start_level:
+        ancestors = ancestors[start_level:]
+    else:
+        ancestors = []
+    return {"ancestors": ancestors}
+
+
+TAGS = {
+    "show_menu": show_menu,
+    "show_menu_below_id": show_menu_below_id,
+    "show_sub_menu": show_sub_menu,
+    "show_breadcrumb": show_breadcrumb,
+}
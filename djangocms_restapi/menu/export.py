@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import gzip
+import os
+from multiprocessing import Pool
+
+from django.db import connections
+from django.test.utils import override_settings
+from django.utils import translation
+
+from cms.models import Page
+from cms.utils.i18n import get_public_languages
+
+from .handler import get_menu_response
+
+
+ENDPOINTS = ("show-menu", "show-menu-below-id", "show-submenu", "show-breadcrumb")
+
+
+def get_exports(site_id, language, endpoints=ENDPOINTS):
+    """
+    Returns a list of ``(endpoint, params, directory)`` tuples for every menu
+    to export for a page. ``show-menu-below-id`` is exported once for every
+    page with a ``reverse_id``.
+    """
+    exports = []
+    for endpoint in endpoints:
+        if endpoint == "show-menu-below-id":
+            reverse_ids = Page.objects.public().filter(site_id=site_id).exclude(reverse_id=None).exclude(
+                reverse_id="").values_list("reverse_id", flat=True)
+            exports.extend((endpoint, {"root_id": reverse_id}, os.path.join(endpoint, reverse_id))
+                           for reverse_id in sorted(set(reverse_ids)))
+        else:
+            exports.append((endpoint, {}, endpoint))
+    return exports
+
+
+def get_page_urls(site_id, language):
+    """
+    Returns the urls of every published page on the site in ``language``.
+    """
+    with translation.override(language):
+        pages = Page.objects.public().published(language=language, site=site_id).order_by("path")
+        return [page.get_absolute_url(language=language) for page in pages]
+
+
+def get_menu_content(endpoint, params, current_page):
+    """
+    Returns the content the menu endpoint responds with to an anonymous
+    request for ``current_page``, as an iterable of chunks.
+    """
+    response = get_menu_response(endpoint, params, current_page)
+    if response.streaming:
+        return response.streaming_content
+    return [response.content]
+
+
+def write_file(path, chunks, compress=False):
+    """
+    Writes the ``chunks`` of content to ``path``, and to ``path`` with a
+    ``.gz`` suffix if ``compress`` is set.
+    """
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    files = [open(path, "wb")]
+    if compress:
+        files.append(gzip.open(path + ".gz", "wb"))
+    try:
+        for chunk in chunks:
+            for f in files:
+                f.write(chunk)
+    finally:
+        for f in files:
+            f.close()
+
+
+def export_pages(task):
+    """
+    Writes the exported menus of the pages in ``task``, which is a
+    ``(site_id, language, page urls, exports, output directory, compress)``
+    tuple. Returns the number of files written.
+    """
+    site_id, language, urls, exports, output_dir, compress = task
+    count = 0
+    with override_settings(SITE_ID=site_id), translation.override(language):
+        for url in urls:
+            for endpoint, params, directory in exports:
+                path = os.path.join(output_dir, str(site_id), language, directory, url.strip("/"), "index.json")
+                write_file(path, get_menu_content(endpoint, params, url), compress)
+                count += 1
+    return count
+
+
+def get_tasks(output_dir, site_ids, compress=False, endpoints=ENDPOINTS, chunk_size=100):
+    """
+    Yields the export tasks for every published page, language and site.
+    """
+    for site_id in site_ids:
+        for language in get_public_languages(site_id):
+            with override_settings(SITE_ID=site_id):
+                exports = get_exports(site_id, language, endpoints)
+                urls = get_page_urls(site_id, language)
+            for i in range(0, len(urls), chunk_size):
+                yield site_id, language, urls[i:i + chunk_size], exports, output_dir, compress
+
+
+def export_menus(output_dir, site_ids, workers=1, compress=False, endpoints=ENDPOINTS):
+    """
+    Exports the menus of every published page to ``output_dir``, using a pool
+    of ``workers`` processes. Returns the number of files written.
+    """
+    tasks = list(get_tasks(output_dir, site_ids, compress, endpoints))
+    if workers <= 1:
+        return sum(export_pages(task) for task in tasks)
+
+    # The worker processes must not share the database connections.
+    for connection in connections.all():
+        connection.close()
+    pool = Pool(workers)
+    try:
+        return sum(pool.imap_unordered(export_pages, tasks))
+    finally:
+        pool.close()
+        pool.join()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+import operator
+import time
+
+from django.utils import six, translation
+
+from rest_framework.compat import SHORT_SEPARATORS, LONG_SEPARATORS
+
+from ..conf import get_setting
+from ..utils import LRUCache
+from . import cache as menu_cache
+from .nodes import FlatNode
+from .renderers import EncodedJSON
+from .serializers import FastNavigationNodeSerializer, FastFlatNavigationNodeSerializer, serialize_fields
+
+
+# Pre-encoded fragments of the page independent fields, keyed by page id.
+# Each entry holds its expiry time, the cache generation it was encoded in
+# and the fragments of each language.
+fragment_cache = LRUCache(maxsize=get_setting("MENU_FRAGMENT_CACHE_SIZE"))
+
+FIELDS = dict(
+    (field[0], field) for field in
+    FastNavigationNodeSerializer.leading_fields + FastNavigationNodeSerializer.trailing_fields
+)
+HEAD_FIELDS = tuple(FIELDS[name] for name in ("id", "title", "url"))
+MIDDLE_FIELDS = tuple(FIELDS[name] for name in ("namespace", "visible"))
+TAIL_FIELDS = tuple(FIELDS[name] for name in ("parent_namespace",))
+FLAG_FIELDS = tuple(FIELDS[name] for name in (
+    "ancestor", "descendant", "sibling", "is_leaf_node", "menu_level", "parent_id"
+))
+
+# Only nodes built from django CMS pages are invalidated when pages are
+# published, nodes from other menus are always encoded from scratch.
+CACHED_NAMESPACE = "CMSMenu"
+
+
+def invalidate_pages(page_ids):
+    """
+    Drops the cached fragments of the pages with the given ids.
+    """
+    for page_id in page_ids:
+        fragment_cache.pop(page_id)
+
+
+class FragmentEncoder(object):
+    """
+    Encodes ``NavigationNodes`` to the same JSON as ``renderer`` would render
+    for the output of ``FastNavigationNodeSerializer``. The fields which don't
+    depend on the current page are encoded once per page and language, and
+    spliced together with the ``selected``, ``ancestor``, ``descendant`` and
+    ``sibling`` flags of the request. Unless ``use_cache`` is set, e.g. for
+    staff members who may see unpublished changes, the fragments are
+    neither read from nor stored in the fragment cache.
+    """
+
+    def __init__(self, renderer, use_cache=True):
+        self.encoder_class = renderer.encoder_class
+        self.ensure_ascii = renderer.ensure_ascii
+        self.separators = SHORT_SEPARATORS if renderer.compact else LONG_SEPARATORS
+        self.item_separator = self.separators[0].encode("utf-8")
+        self.language = translation.get_language()
+        self.keys = {}
+        self.use_cache = use_cache
+        cache = menu_cache.get_cache()
+        # Pages published by other processes bump the shared generation.
+        self.generation = menu_cache.get_generation(cache) if cache is not None else None
+
+    def dumps(self, value):
+        ret = json.dumps(value, cls=self.encoder_class, ensure_ascii=self.ensure_ascii,
+                         separators=self.separators)
+        if isinstance(ret, six.text_type):
+            # Escaped just like ``JSONRenderer`` does it.
+            ret = ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode("utf-8")
+        return ret
+
+    def encode_member(self, name, value):
+        key = self.keys.get(name)
+        if key is None:
+            key = self.keys[name] = self.dumps(name) + self.separators[1].encode("utf-8")
+        if isinstance(value, EncodedJSON):
+            return key + value
+        elif value is True:
+            return key + b"true"
+        elif value is False:
+            return key + b"false"
+        elif value is None:
+            return key + b"null"
+        return key + self.dumps(value)
+
+    def encode_members(self, data):
+        return self.item_separator.join(self.encode_member(name, value) for name, value in data.items())
+
+    def get_languages(self, node_id):
+        """
+        Returns the cached fragments of the page with ``node_id`` in each
+        language, unless they've expired or were encoded in an older
+        generation.
+        """
+        entry = fragment_cache.get(node_id)
+        if entry is None or entry[0] <= time.time() or entry[1] != self.generation:
+            return {}
+        return entry[2]
+
+    def get_fragments(self, node):
+        """
+        Returns the encoded ``(head, middle, tail)`` fragments of ``node``.
+        Fragments are kept for ``MENU_FRAGMENT_TIMEOUT`` seconds, or until
+        the page is published, unpublished, moved or deleted.
+        """
+        cacheable = self.use_cache and node.namespace == CACHED_NAMESPACE
+        if cacheable:
+            fragments = self.get_languages(node.id).get(self.language)
+            if fragments is not None:
+                return fragments
+
+        attrs = serialize_fields(node.attr, FastNavigationNodeSerializer.attribute_fields, operator.getitem)
+        fragments = (
+            b"{" + self.encode_members(serialize_fields(node, HEAD_FIELDS)),
+            self.encode_members(serialize_fields(node, MIDDLE_FIELDS)),
+            self.item_separator.join((
+                self.encode_members(serialize_fields(node, TAIL_FIELDS)),
+                self.encode_member("attrs", attrs),
+            )),
+        )
+        if cacheable:
+            # The cached dicts are never modified, since other threads may be reading them.
+            languages = dict(self.get_languages(node.id))
+            languages[self.language] = fragments
+            expires = time.time() + get_setting("MENU_FRAGMENT_TIMEOUT")
+            fragment_cache.set(node.id, (expires, self.generation, languages))
+        return fragments
+
+    def encode_node(self, node):
+        head, middle, tail = self.get_fragments(node)
+        parent = node.parent
+        parts = [
+            head,
+            self.encode_members(serialize_fields(node, (FIELDS["selected"],))),
+            middle,
+            self.encode_members(serialize_fields(node, FLAG_FIELDS)),
+            self.encode_member("parent_url", parent.url if parent else None),
+            tail,
+        ]
+        if isinstance(node, FlatNode):
+            parts.append(self.encode_members(serialize_fields(node, FastFlatNavigationNodeSerializer.extra_fields)))
+        elif hasattr(node, "children"):
+            parts.append(self.encode_member("children", self.encode(node.children)))
+        return self.item_separator.join(part for part in parts if part) + b"}"
+
+    def encode(self, nodes):
+        """
+        Returns the encoded list of ``nodes``.
+        """
+        if nodes is None:
+            return None
+        return EncodedJSON(b"[" + self.item_separator.join(self.encode_node(node) for node in nodes) + b"]")
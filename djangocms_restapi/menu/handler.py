@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import threading
+
+from django.contrib.sites.models import Site
+from django.core.handlers.base import BaseHandler
+from django.core.urlresolvers import reverse
+from django.test import RequestFactory
+from django.utils import translation
+
+
+_lock = threading.Lock()
+_handler = None
+
+
+def get_handler():
+    """
+    Returns the request handler of the process, with the middleware of the
+    project loaded.
+    """
+    global _handler
+    with _lock:
+        if _handler is None:
+            handler = BaseHandler()
+            handler.load_middleware()
+            _handler = handler
+        return _handler
+
+
+def get_menu_response(endpoint, params, current_page):
+    """
+    Returns the rendered response of the menu endpoint to an anonymous
+    request for ``current_page`` in the active language, on the current
+    site. The request goes through the middleware and the default code
+    path of the view, just like requests from clients do, except that
+    neither ``request_started`` nor ``request_finished`` is sent.
+    """
+    path = reverse("%s-list" % endpoint)
+    request = RequestFactory().get(
+        path, dict(params, current_page=current_page),
+        HTTP_HOST=Site.objects.get_current().domain, HTTP_ACCEPT_LANGUAGE=translation.get_language()
+    )
+    return get_handler().get_response(request)
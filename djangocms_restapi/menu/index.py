@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from rest_framework.request import clone_request
+
+from ..conf import get_setting
+from ..utils import LRUCache
+from . import engine
+from .conditional import get_tree_key
+from .nodes import NodeOverlay, compact_nodes
+
+
+# Node indexes keyed by the site, language, visibility and version of the tree.
+index_cache = LRUCache(maxsize=get_setting("NODE_INDEX_CACHE_SIZE"))
+
+
+class NodeIndex(object):
+    """
+    Looks up the nodes of a menu by their id and by the ``reverse_id`` of
+    their page. The indexed nodes are shared, and are never modified.
+    """
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.by_id = {}
+        self.by_reverse_id = {}
+        for node in nodes:
+            self.by_id.setdefault((node.namespace, node.id), node)
+            reverse_id = node.attr.get("reverse_id")
+            if reverse_id:
+                # The first node wins, like ``menu_pool.get_nodes_by_attribute``.
+                self.by_reverse_id.setdefault(reverse_id, node)
+
+    def get(self, id=None, reverse_id=None, namespace="CMSMenu"):
+        """
+        Returns the node with ``id`` in ``namespace``, or the node with
+        ``reverse_id``, or ``None`` if there's no such node.
+        """
+        if reverse_id:
+            return self.by_reverse_id.get(reverse_id)
+        return self.by_id.get((namespace, id))
+
+    def get_selected(self, path):
+        """
+        Returns the node selected for ``path``, which is the node with the
+        longest url ``path`` starts with, like ``menu_pool._mark_selected``.
+        """
+        selected = None
+        for node in self.nodes:
+            url = node.get_absolute_url()
+            if url == path[:len(url)] and (selected is None or len(url) > len(selected.get_absolute_url())):
+                selected = node
+        return selected
+
+
+def get_ancestors(node):
+    ret = []
+    node = node.parent
+    while node is not None:
+        ret.append(node)
+        node = node.parent
+    return ret
+
+
+def overlay_subtree(node, selected=None, max_depth=None):
+    """
+    Returns ``node`` and its descendants, down to ``max_depth`` levels, in
+    ``NodeOverlays`` which mark them as selected, ancestor, descendant or
+    sibling of the ``selected`` node, mirroring ``menus.modifiers.Marker``.
+    Their ``menu_level`` is relative to ``node``. Descendants hidden from
+    the navigation are left out together with their subtrees, like
+    ``cut_levels`` does, but ``node`` itself is always kept, like
+    ``show_menu_below_id`` does. The indexed nodes are shared between
+    requests, and are never modified.
+    """
+    ancestors = set(map(id, get_ancestors(selected))) if selected is not None else set()
+    below_selected = selected is not None and any(ancestor is selected for ancestor in get_ancestors(node))
+
+    def overlay(node, depth, descendant):
+        return NodeOverlay(
+            node,
+            selected=node is selected,
+            ancestor=id(node) in ancestors,
+            descendant=descendant,
+            sibling=selected is not None and node is not selected and node.parent is selected.parent,
+            menu_level=depth,
+        )
+
+    # The tree is walked iteratively, so deep trees can't exceed the recursion limit.
+    root = overlay(node, 0, below_selected)
+    stack = [(root, node, 0, below_selected)]
+    while stack:
+        ret, node, depth, descendant = stack.pop()
+        ret.children = []
+        if max_depth is not None and depth + 1 >= max_depth:
+            continue
+        descendant = descendant or node is selected
+        for child in node.children:
+            if not child.visible:
+                continue
+            child_overlay = overlay(child, depth + 1, descendant)
+            child_overlay.parent = ret
+            ret.children.append(child_overlay)
+            stack.append((child_overlay, child, depth + 1, descendant))
+    return root
+
+
+def get_subtree(index, node, max_depth=None, path=None):
+    """
+    Returns the indexed ``node`` and its descendants down to ``max_depth``
+    levels, marked relative to the node selected for ``path``.
+    """
+    return overlay_subtree(node, index.get_selected(path) if path else None, max_depth)
+
+
+def build_index(request):
+    """
+    Builds the index of the full, unselected node tree for ``request``. The
+    tree is kept as ``CompactNodes``, since an index is kept for every site,
+    language and visibility.
+    """
+    request = clone_request(request, request.method)
+    # No node is selected for an empty path, so no nodes are cut away.
+    request.path = request.path_info = ""
+    return NodeIndex(compact_nodes(engine.get_nodes(request)))
+
+
+def get_index(request):
+    """
+    Returns the node index for ``request``. Indexes are built once per
+    version of the page tree, and shared by all the requests of the same
+    visibility. Indexes for staff members, who may see draft pages, are
+    never kept.
+    """
+    if request.user.is_staff:
+        return build_index(request)
+
+    return index_cache.get_or_set(get_tree_key(request), lambda: build_index(request))
+
+
+def invalidate():
+    """
+    Drops all the node indexes.
+    """
+    index_cache.clear()
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import copy
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+from django.utils.encoding import smart_str
+
+from menus.base import NavigationNode
+
+
+class FlatNode(object):
+    """
+    Wraps a ``NavigationNode`` with its ``depth`` in the menu and its
+    ``position`` among its siblings. Every other attribute is read from
+    the wrapped node.
+    """
+
+    def __init__(self, node, depth, position):
+        self.node = node
+        self.depth = depth
+        self.position = position
+
+    def __getattr__(self, name):
+        return getattr(self.node, name)
+
+
+class NodeOverlay(object):
+    """
+    Overlays the state of a single request, like the selection state set by
+    the modifiers, on a node which is shared between requests. The ``state``
+    attributes are read from the overlay, the ``hidden`` attributes are left
+    out, and every other attribute is read from the shared node, which is
+    never modified.
+    """
+    hidden = ()
+
+    def __init__(self, node, hidden=(), **state):
+        self.node = node
+        if hidden:
+            self.hidden = frozenset(hidden)
+        self.__dict__.update(state)
+
+    def __getattr__(self, name):
+        if name == "node" or name in self.hidden:
+            raise AttributeError(name)
+        return getattr(self.node, name)
+
+
+def flatten_nodes(nodes, max_depth=None):
+    """
+    Yields a ``FlatNode`` for every node in the tree in pre-order, down to
+    ``max_depth`` levels if given. The tree is walked iteratively, so deep
+    trees can't exceed the recursion limit.
+    """
+    stack = [FlatNode(node, 0, position) for position, node in enumerate(nodes)]
+    stack.reverse()
+    while stack:
+        flat_node = stack.pop()
+        yield flat_node
+
+        children = getattr(flat_node.node, "children", None) or []
+        depth = flat_node.depth + 1
+        if max_depth is not None and depth >= max_depth:
+            continue
+        stack.extend(FlatNode(child, depth, position) for position, child in reversed(list(enumerate(children))))
+
+
+class NodeAttributes(Mapping):
+    """
+    A read-only ``NavigationNode.attr``, which keeps its values in a tuple.
+    The tuple of keys is shared by every node with the same attributes.
+    """
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys, values):
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __copy__(self):
+        # Read-only, so copies of the nodes share it.
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class CompactNode(object):
+    """
+    A ``NavigationNode`` without a per-instance ``__dict__``, for node trees
+    which are kept in memory. Only the attributes of ``NavigationNode`` and
+    those set by the modifiers of the menu pool are kept. Compact nodes are
+    never modified once built, but their copies may be, so copies of a tree
+    go through the modifiers, ``cut_levels`` and ``cut_after`` like trees of
+    ``NavigationNodes`` do.
+    """
+    __slots__ = (
+        "id", "title", "url", "namespace", "parent_id", "parent_namespace", "visible", "attr", "parent",
+        "children", "level", "menu_level", "selected", "ancestor", "descendant", "sibling", "is_leaf_node",
+    )
+
+    def __copy__(self):
+        ret = CompactNode.__new__(CompactNode)
+        for name in self.__slots__:
+            try:
+                setattr(ret, name, getattr(self, name))
+            except AttributeError:
+                pass
+        return ret
+
+    def __deepcopy__(self, memo):
+        ret = memo.get(id(self))
+        if ret is None:
+            ret = memo[id(self)] = copy.copy(self)
+            if self.parent is not None:
+                ret.parent = copy.deepcopy(self.parent, memo)
+            ret.children = [copy.deepcopy(child, memo) for child in self.children]
+        return ret
+
+    def __repr__(self):
+        return "<Navigation Node: %s>" % smart_str(self.title)
+
+    def get_menu_title(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return self.url
+
+    def get_attribute(self, name):
+        return self.attr.get(name, None)
+
+    def get_descendants(self):
+        return sum(([node] + node.get_descendants() for node in self.children), [])
+
+    def get_ancestors(self):
+        if self.parent:
+            return [self.parent] + self.parent.get_ancestors()
+        return []
+
+
+def get_attributes(attributes, attr):
+    """
+    Returns the ``NodeAttributes`` of the ``attr`` dict, sharing them through
+    the ``attributes`` dict between the nodes with equal attributes, and the
+    keys between the nodes with the same attributes.
+    """
+    keys = tuple(attr)
+    keys = attributes.setdefault(keys, keys)
+    values = tuple(attr[key] for key in keys)
+    try:
+        return attributes.setdefault((keys, values), NodeAttributes(keys, values))
+    except TypeError:
+        # Unhashable values aren't shared.
+        return NodeAttributes(keys, values)
+
+
+def link_copies(nodes, copies):
+    """
+    Links the ``copies`` of the list of linked ``nodes`` in the same way,
+    each with a list of children of its own. Links to nodes which aren't
+    listed are dropped.
+    """
+    by_id = dict((id(node), node_copy) for node, node_copy in zip(nodes, copies))
+    for node, node_copy in zip(nodes, copies):
+        node_copy.parent = by_id.get(id(node.parent)) if node.parent is not None else None
+        node_copy.children = [by_id[id(child)] for child in node.children if id(child) in by_id]
+    return copies
+
+
+def copy_node(node):
+    ret = copy.copy(node)
+    if isinstance(ret.attr, dict):
+        ret.attr = dict(ret.attr)
+    return ret
+
+
+def copy_nodes(nodes):
+    """
+    Returns a copy of the list of linked nodes, like ``copy.deepcopy``
+    would, except that the tree is copied iteratively, and that the values
+    of the attributes of the nodes are shared.
+    """
+    return link_copies(nodes, [copy_node(node) for node in nodes])
+
+
+def compact_nodes(nodes):
+    """
+    Returns a list of ``CompactNodes`` for the list of linked
+    ``NavigationNodes``, in the same order and linked in the same way.
+    Nodes of subclasses of ``NavigationNode``, which may behave differently,
+    are copied instead. Links to nodes which aren't listed are dropped.
+    """
+    # The attributes shared between the nodes.
+    attributes = {}
+    ret = []
+    for node in nodes:
+        if type(node) not in (NavigationNode, CompactNode):
+            ret.append(copy_node(node))
+            continue
+        compact_node = CompactNode.__new__(CompactNode)
+        for name in CompactNode.__slots__:
+            if name not in ("attr", "parent", "children"):
+                try:
+                    setattr(compact_node, name, getattr(node, name))
+                except AttributeError:
+                    pass
+        compact_node.attr = get_attributes(attributes, node.attr)
+        ret.append(compact_node)
+    return link_copies(nodes, ret)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import operator
+import time
+from functools import reduce
+
+from django.contrib.auth.models import Permission
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache as default_cache
+from django.db.models import Q
+from django.utils import six
+
+from cms.models import GlobalPagePermission, PagePermission
+from cms.utils.conf import get_cms_setting
+from cms.utils.permissions import has_global_page_permission
+from menus.models import CacheKey
+
+from ..conf import get_setting
+from ..utils import LRUCache
+from . import cache as menu_cache
+
+
+# Permission classes keyed by the user, site and cache generation.
+permission_class_cache = LRUCache(maxsize=get_setting("PERMISSION_CLASS_CACHE_SIZE"))
+
+
+def is_partitioned(request):
+    """
+    Returns ``True`` if the pages visible to the user making ``request``
+    depend on the permissions of the user, rather than only on whether the
+    user is authenticated. Staff members are never partitioned, as they may
+    see draft pages.
+    """
+    user = request.user
+    return get_cms_setting("PERMISSION") and user.is_authenticated() and not user.is_staff
+
+
+def get_grantees():
+    """
+    Returns the ids of the users and of the groups which have been granted
+    view permissions on single pages.
+    """
+    user_ids, group_ids = set(), set()
+    for user_id, group_id in PagePermission.objects.filter(can_view=True).values_list("user_id", "group_id"):
+        if user_id is not None:
+            user_ids.add(user_id)
+        if group_id is not None:
+            group_ids.add(group_id)
+    return user_ids, group_ids
+
+
+def get_permissions(request):
+    """
+    Returns everything the pages visible to the authenticated user making
+    ``request`` depend on, mirroring ``cms.menu.get_visible_page_objects``.
+    Users with the same permissions see the same pages.
+    """
+    user = request.user
+    site = get_current_site(request)
+    user_ids, group_ids = get_grantees()
+    groups = sorted(set(user.groups.values_list("pk", flat=True)) & group_ids)
+    return (
+        has_global_page_permission(request, site, can_view=True),
+        user.has_perm("cms.view_page"),
+        groups,
+        # Users granted permissions of their own are classes of their own.
+        user.pk if user.pk in user_ids else None,
+    )
+
+
+def get_permission_class(request):
+    """
+    Returns the fingerprint of the permissions of the authenticated user
+    making ``request``, which is shared by every user who sees the same
+    pages. Fingerprints are kept for ``PERMISSION_CLASS_TIMEOUT`` seconds, or
+    until page permissions or global page permissions change. Group
+    memberships changed by other processes are only noticed once the
+    fingerprint has expired.
+    """
+    key = (request.user.pk, get_current_site(request).pk)
+    cache = menu_cache.get_cache()
+    if cache is not None:
+        # Permissions changed by other processes bump the shared generation.
+        key += (menu_cache.get_generation(cache),)
+
+    entry = permission_class_cache.get(key)
+    if entry is not None and entry[0] > time.time():
+        return entry[1]
+
+    permissions = get_permissions(request)
+    permission_class = hashlib.md5(six.text_type(permissions).encode("utf-8")).hexdigest()[:16]
+    permission_class_cache.set(key, (time.time() + get_setting("PERMISSION_CLASS_TIMEOUT"), permission_class))
+    return permission_class
+
+
+def grant_view(group_ids):
+    """
+    Returns ``True`` if any of the groups with ``group_ids`` holds a page
+    permission, a global page permission or the ``cms.view_page``
+    permission, so its members may see other pages than everyone else.
+    """
+    return (
+        PagePermission.objects.filter(group__in=group_ids, can_view=True).exists() or
+        GlobalPagePermission.objects.filter(group__in=group_ids, can_view=True).exists() or
+        Permission.objects.filter(group__in=group_ids, content_type__app_label="cms",
+                                  codename="view_page").exists()
+    )
+
+
+def clear_user_nodes(user_ids=None):
+    """
+    Drops the node trees django CMS caches for each of the users with
+    ``user_ids``, or for every authenticated user, leaving the trees of
+    anonymous users alone.
+    """
+    if user_ids is None:
+        cache_keys = CacheKey.objects.filter(key__endswith="_user")
+    elif user_ids:
+        # The keys end with "_<user pk>_user", see ``menu_pool._build_nodes``.
+        cache_keys = CacheKey.objects.filter(reduce(operator.or_, (
+            Q(key__endswith="_%s_user" % user_id) for user_id in user_ids
+        )))
+    else:
+        return
+    to_be_deleted = list(cache_keys.distinct().values_list("key", flat=True))
+    if to_be_deleted:
+        default_cache.delete_many(to_be_deleted)
+        cache_keys.delete()
+
+
+def invalidate():
+    """
+    Drops all the permission classes.
+    """
+    permission_class_cache.clear()
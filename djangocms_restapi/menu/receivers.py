@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from cms.models import GlobalPagePermission, Page, PagePermission
+from cms.signals import page_moved, post_publish, post_unpublish
+from menus.menu_pool import menu_pool
+
+from . import cache, engine, fragments, index, permissions, resolver, warming
+
+
+@receiver(post_publish, sender=Page, dispatch_uid="djangocms_restapi_menu_post_publish")
+@receiver(post_unpublish, sender=Page, dispatch_uid="djangocms_restapi_menu_post_unpublish")
+@receiver(page_moved, sender=Page, dispatch_uid="djangocms_restapi_menu_page_moved")
+@receiver(post_delete, sender=Page, dispatch_uid="djangocms_restapi_menu_post_delete")
+def invalidate_menu_cache(sender, **kwargs):
+    """
+    Invalidates the cached menu responses, resolved pages and node indexes
+    whenever the page tree changes.
+    """
+    cache.invalidate()
+    resolver.invalidate()
+    index.invalidate()
+
+
+@receiver(post_publish, sender=Page, dispatch_uid="djangocms_restapi_fragments_post_publish")
+@receiver(post_unpublish, sender=Page, dispatch_uid="djangocms_restapi_fragments_post_unpublish")
+def invalidate_page_fragments(sender, instance, **kwargs):
+    """
+    Drops the encoded fragments of a published or unpublished page, and of
+    its descendants, since their urls contain the slug of the page.
+    """
+    public_page = instance.publisher_public
+    if public_page is not None:
+        page_ids = [public_page.pk]
+        page_ids.extend(public_page.get_descendants().values_list("pk", flat=True))
+        fragments.invalidate_pages(page_ids)
+
+
+@receiver(page_moved, sender=Page, dispatch_uid="djangocms_restapi_fragments_page_moved")
+@receiver(post_delete, sender=Page, dispatch_uid="djangocms_restapi_fragments_post_delete")
+def clear_fragments(sender, **kwargs):
+    """
+    Drops all encoded fragments when the structure of the page tree changes.
+    """
+    fragments.fragment_cache.clear()
+
+
+@receiver(post_publish, sender=Page, dispatch_uid="djangocms_restapi_warming_post_publish")
+def warm_menu_cache(sender, instance, **kwargs):
+    """
+    Warms the cached menus affected by publishing a page, once the cached
+    menus have been invalidated.
+    """
+    public_page = instance.publisher_public
+    if public_page is not None:
+        warming.warm_after_publish(public_page)
+
+
+@receiver(request_finished, dispatch_uid="djangocms_restapi_warming_request_finished")
+def queue_deferred_warming(sender, **kwargs):
+    """
+    Queues the menus of the pages published during the request, on Django
+    versions without ``transaction.on_commit``. The transaction of the
+    request has been committed by now.
+    """
+    warming.queue_deferred()
+
+
+@receiver(post_save, sender=PagePermission, dispatch_uid="djangocms_restapi_permissions_page_save")
+@receiver(post_delete, sender=PagePermission, dispatch_uid="djangocms_restapi_permissions_page_delete")
+@receiver(post_save, sender=GlobalPagePermission, dispatch_uid="djangocms_restapi_permissions_global_save")
+@receiver(post_delete, sender=GlobalPagePermission, dispatch_uid="djangocms_restapi_permissions_global_delete")
+def invalidate_permission_classes(sender, **kwargs):
+    """
+    Drops the permission classes, and everything cached per permission
+    class, whenever page permissions change. Page permissions restrict the
+    pages anonymous users see as well, so every cached menu is dropped. The
+    node trees django CMS caches per user are dropped as well, since the
+    shared trees are built from them.
+    """
+    menu_pool.clear(all=True)
+    permissions.invalidate()
+    engine.tree_cache.clear()
+    index.invalidate()
+    cache.invalidate()
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through, dispatch_uid="djangocms_restapi_permissions_groups")
+def invalidate_group_members(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drops the permission classes, and the node trees django CMS caches for
+    the users who joined or left a group holding permissions. The trees
+    and responses cached per permission class are kept, since the users
+    simply move to another class.
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        group_ids, user_ids = [instance.pk], pk_set
+    else:
+        group_ids, user_ids = pk_set, [instance.pk]
+    # The groups a user was removed from are unknown once they're cleared.
+    if group_ids is not None and not permissions.grant_view(group_ids):
+        return
+
+    permissions.invalidate()
+    permissions.clear_user_nodes(user_ids)
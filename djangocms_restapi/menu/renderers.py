@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from django.utils import six
+
+from rest_framework.compat import INDENT_SEPARATORS, LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+
+from .compact import pack
+
+
+class EncodedJSON(bytes):
+    """
+    JSON which has already been encoded.
+    """
+
+
+class MenuJSONRenderer(JSONRenderer):
+    """
+    Renders data to JSON, passing ``EncodedJSON`` through unchanged.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, EncodedJSON):
+            return bytes(data)
+        return super(MenuJSONRenderer, self).render(data, accepted_media_type, renderer_context)
+
+    def render_chunks(self, data, accepted_media_type=None, renderer_context=None, chunk_size=64 * 1024):
+        """
+        Renders data to the same JSON as ``render``, but yields it in chunks
+        of about ``chunk_size`` bytes while it's being encoded.
+        """
+        if data is None:
+            return
+        if isinstance(data, EncodedJSON):
+            yield bytes(data)
+            return
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is None:
+            separators = SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+        else:
+            separators = INDENT_SEPARATORS
+        encoder = self.encoder_class(indent=indent, ensure_ascii=self.ensure_ascii, separators=separators)
+
+        chunks = []
+        size = 0
+        for chunk in encoder.iterencode(data):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= chunk_size:
+                yield self.encode_chunk("".join(chunks))
+                chunks = []
+                size = 0
+        if chunks:
+            yield self.encode_chunk("".join(chunks))
+
+    @staticmethod
+    def encode_chunk(chunk):
+        if isinstance(chunk, six.text_type):
+            # Escaped just like ``JSONRenderer`` does it.
+            chunk = chunk.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode("utf-8")
+        return chunk
+
+
+class CompactMenuRenderer(JSONRenderer):
+    """
+    Renders menus in the compact columnar format of ``menu.compact``, where
+    every list of nodes is packed into a table of rows with a string table.
+    ``menu.compact.decode`` turns the output back into the regular data.
+    """
+    media_type = "application/vnd.djangocms-restapi.compact+json"
+    format = "compact"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super(CompactMenuRenderer, self).render(pack(data), accepted_media_type, renderer_context)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import time
+
+from django.contrib.sites.shortcuts import get_current_site
+from django.utils import translation
+
+from cms.middleware.page import get_page
+from cms.models import Page
+
+from ..conf import get_setting
+from ..utils import LRUCache
+from . import cache as menu_cache
+
+
+# Primary keys of the resolved pages keyed by the normalized path, language and site.
+page_cache = LRUCache(maxsize=get_setting("PAGE_RESOLVER_CACHE_SIZE"))
+
+
+def is_cacheable(request):
+    """
+    Returns ``True`` if the page resolved for ``request`` may be cached. Staff
+    members may see draft pages, and previews are never cached.
+    """
+    return not request.user.is_staff and "preview" not in request.GET
+
+
+def make_key(request):
+    key = (
+        request.path_info.rstrip("/") or "/",
+        translation.get_language(),
+        get_current_site(request).pk,
+    )
+    cache = menu_cache.get_cache()
+    if cache is not None:
+        # Pages published by other processes bump the shared generation.
+        key += (menu_cache.get_generation(cache),)
+    return key
+
+
+def resolve_page(request):
+    """
+    Resolves the current page of ``request``, which must have been ran
+    through the ``CurrentPageMiddleware``. The primary keys of the resolved
+    pages are cached in memory for ``PAGE_RESOLVER_TIMEOUT`` seconds, or
+    until a page is published, unpublished, moved or deleted, and the page
+    is fetched by its primary key, so every request gets its own instance.
+    Unless the resolver is enabled, the page is left to be resolved lazily
+    by the middleware.
+    """
+    if not get_setting("PAGE_RESOLVER") or not is_cacheable(request):
+        return None
+
+    key = make_key(request)
+    entry = page_cache.get(key)
+    if entry is not None and entry[0] > time.time():
+        pk = entry[1]
+        page = Page.objects.filter(pk=pk).first() if pk is not None else None
+        # The page may have been deleted in the meantime.
+        if page is not None or pk is None:
+            request._current_page_cache = page
+            return page
+
+    page = get_page(request)
+    page_cache.set(key, (time.time() + get_setting("PAGE_RESOLVER_TIMEOUT"), getattr(page, "pk", None)))
+    return page
+
+
+def invalidate():
+    """
+    Drops all the resolved pages.
+    """
+    page_cache.clear()
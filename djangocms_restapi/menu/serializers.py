@@ -2,14 +2,67 @@
 
 from __future__ import absolute_import, unicode_literals
 
+import operator
+from collections import OrderedDict
+
+from django.utils import six
+
 from rest_framework import serializers
 from rest_framework_recursive.fields import RecursiveField
 
 
-class NodeAttributeSerializer(serializers.Serializer):
+# Fields describing the structure of the menu, which are kept when the
+# fields are limited with ``fields``, unless they are excluded.
+STRUCTURAL_FIELDS = ("children", "depth", "position")
+
+
+def parse_fields(value):
+    """
+    Returns the set of comma separated field names in ``value``, or
+    ``None`` if there are none.
+    """
+    names = set(name.strip() for name in (value or "").split(",")) - {""}
+    return names or None
+
+
+def select_fields(names, fields=None, exclude=None, prefix="", keep=()):
+    """
+    Returns the field ``names`` selected by the sets of ``fields`` and
+    ``exclude``. Nested fields are given as ``<field>.<name>``, and are
+    selected with ``prefix`` set to ``"<field>."``. All of the nested fields
+    are selected if only the field itself is listed in ``fields``. The
+    ``keep`` fields are selected unless they are excluded.
+    """
+    if fields:
+        selected = set(name[len(prefix):].split(".")[0] for name in fields if name.startswith(prefix))
+        if selected:
+            names = [name for name in names if name in selected or name in keep]
+    if exclude:
+        names = [name for name in names if prefix + name not in exclude]
+    return names
+
+
+class SparseFieldsMixin(object):
+    """
+    Limits the fields of a serializer to the ``fields`` and ``exclude``
+    sets of the serializer context.
+    """
+    field_prefix = ""
+
+    def get_fields(self):
+        fields = super(SparseFieldsMixin, self).get_fields()
+        names = select_fields(
+            list(fields), self.context.get("fields"), self.context.get("exclude"), self.field_prefix, STRUCTURAL_FIELDS
+        )
+        return OrderedDict((name, fields[name]) for name in names)
+
+
+class NodeAttributeSerializer(SparseFieldsMixin, serializers.Serializer):
     """
     Serializes ``NavigationNode.attr``
     """
+    field_prefix = "attrs."
+
     auth_required = serializers.BooleanField()
     is_home = serializers.BooleanField()
     redirect_url = serializers.CharField()
@@ -19,9 +72,9 @@ class NodeAttributeSerializer(serializers.Serializer):
     visible_for_authenticated = serializers.BooleanField()
 
 
-class NavigationNodeSerializer(serializers.Serializer):
+class BaseNavigationNodeSerializer(SparseFieldsMixin, serializers.Serializer):
     """
-    Serializes a ``NavigationNode``
+    Serializes a ``NavigationNode`` without its children
     """
     id = serializers.IntegerField()
     title = serializers.CharField()
@@ -38,13 +91,231 @@ class NavigationNodeSerializer(serializers.Serializer):
     parent_url = serializers.SerializerMethodField()
     parent_namespace = serializers.CharField()
     attrs = serializers.SerializerMethodField()
-    children = serializers.ListField(child=RecursiveField(), required=False)
 
-    @staticmethod
-    def get_attrs(instance):
-        return NodeAttributeSerializer(instance.attr, many=False).data
+    def get_attrs(self, instance):
+        return NodeAttributeSerializer(instance.attr, many=False, context=self.context).data
 
     @staticmethod
     def get_parent_url(instance):
         if instance.parent:
             return instance.parent.url
+
+
+class NavigationNodeSerializer(BaseNavigationNodeSerializer):
+    """
+    Serializes a ``NavigationNode`` and its children
+    """
+    children = serializers.ListField(child=RecursiveField(), required=False)
+
+    def get_depth(self):
+        """
+        Returns the depth of the serialized nodes in the menu.
+        """
+        depth = 0
+        parent = self.parent
+        while parent is not None:
+            if isinstance(parent, NavigationNodeSerializer):
+                depth += 1
+            parent = parent.parent
+        return depth
+
+    def get_fields(self):
+        fields = super(NavigationNodeSerializer, self).get_fields()
+        max_depth = self.context.get("max_depth")
+        if max_depth is not None and self.get_depth() + 1 >= max_depth:
+            # Stops the recursion at the deepest level.
+            fields.pop("children", None)
+        return fields
+
+
+class FlatNavigationNodeSerializer(BaseNavigationNodeSerializer):
+    """
+    Serializes a ``FlatNode``
+    """
+    depth = serializers.IntegerField()
+    position = serializers.IntegerField()
+
+
+def to_boolean(value):
+    """
+    Mirrors ``BooleanField.to_representation``.
+    """
+    if value in serializers.BooleanField.TRUE_VALUES:
+        return True
+    elif value in serializers.BooleanField.FALSE_VALUES:
+        return False
+    return bool(value)
+
+
+def serialize_fields(instance, fields, getter=getattr):
+    """
+    Returns an ``OrderedDict`` with the ``fields`` of ``instance``. Every field
+    is a ``(name, to_representation, required)`` tuple. Missing values are
+    left out for optional fields, and ``None`` values are never converted,
+    just like in REST framework serializers.
+    """
+    ret = OrderedDict()
+    for name, to_representation, required in fields:
+        try:
+            value = getter(instance, name)
+        except (AttributeError, KeyError):
+            if required:
+                raise
+            continue
+        ret[name] = None if value is None else to_representation(value)
+    return ret
+
+
+class FastNavigationNodeSerializer(object):
+    """
+    Serializes a ``NavigationNode`` and its children straight into plain
+    dicts, without the per node and per field overhead of REST framework
+    fields. The output is identical to ``NavigationNodeSerializer``.
+    """
+    attribute_fields = (
+        ("auth_required", to_boolean, True),
+        ("is_home", to_boolean, True),
+        ("redirect_url", six.text_type, True),
+        ("reverse_id", six.text_type, True),
+        ("soft_root", to_boolean, True),
+        ("visible_for_anonymous", to_boolean, True),
+        ("visible_for_authenticated", to_boolean, True),
+    )
+    leading_fields = (
+        ("id", int, True),
+        ("title", six.text_type, True),
+        ("url", six.text_type, True),
+        ("selected", to_boolean, True),
+        ("namespace", six.text_type, True),
+        ("visible", to_boolean, True),
+        ("ancestor", to_boolean, True),
+        ("descendant", to_boolean, True),
+        ("sibling", to_boolean, True),
+        ("is_leaf_node", to_boolean, False),
+        ("menu_level", int, False),
+        ("parent_id", int, True),
+    )
+    trailing_fields = (
+        ("parent_namespace", six.text_type, True),
+    )
+    extra_fields = ()
+    include_parent_url = True
+    include_attrs = True
+    include_children = True
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+        self.max_depth = self.context.get("max_depth")
+
+        fields, exclude = self.context.get("fields"), self.context.get("exclude")
+        if fields or exclude:
+            # Limits the fields on the instance, leaving the class defaults alone.
+            names = set(select_fields(self.get_field_names(), fields, exclude, keep=STRUCTURAL_FIELDS))
+            for name in ("leading_fields", "trailing_fields", "extra_fields"):
+                setattr(self, name, tuple(field for field in getattr(self, name) if field[0] in names))
+            attribute_names = select_fields(
+                [field[0] for field in self.attribute_fields], fields, exclude, prefix="attrs."
+            )
+            self.attribute_fields = tuple(field for field in self.attribute_fields if field[0] in attribute_names)
+            self.include_parent_url = "parent_url" in names
+            self.include_attrs = "attrs" in names
+            self.include_children = self.include_children and "children" in names
+
+    def get_field_names(self):
+        """
+        Returns the names of all the fields, in order.
+        """
+        return (
+            [field[0] for field in self.leading_fields] + ["parent_url"] +
+            [field[0] for field in self.trailing_fields] + ["attrs"] +
+            [field[0] for field in self.extra_fields] + (["children"] if self.include_children else [])
+        )
+
+    @property
+    def data(self):
+        if self.many:
+            return self.serialize_nodes(self.instance)
+        return self.to_representation(self.instance)
+
+    def serialize_nodes(self, nodes, depth=0):
+        """
+        Returns the serialized list of ``nodes`` at ``depth`` in the menu.
+        """
+        return [self.to_representation(node, depth) for node in nodes]
+
+    def to_representation(self, instance, depth=0):
+        ret = serialize_fields(instance, self.leading_fields)
+        if self.include_parent_url:
+            parent = instance.parent
+            ret["parent_url"] = parent.url if parent else None
+        ret.update(serialize_fields(instance, self.trailing_fields))
+        if self.include_attrs:
+            ret["attrs"] = serialize_fields(instance.attr, self.attribute_fields, operator.getitem)
+        ret.update(serialize_fields(instance, self.extra_fields))
+
+        if self.include_children and hasattr(instance, "children") and (
+                self.max_depth is None or depth + 1 < self.max_depth):
+            children = instance.children
+            ret["children"] = None if children is None else self.serialize_nodes(children, depth + 1)
+        return ret
+
+
+class FastFlatNavigationNodeSerializer(FastNavigationNodeSerializer):
+    """
+    Serializes a ``FlatNode``. The output is identical to
+    ``FlatNavigationNodeSerializer``.
+    """
+    extra_fields = (
+        ("depth", int, True),
+        ("position", int, True),
+    )
+    include_children = False
+
+
+class LazyList(list):
+    """
+    A list which serializes its items only while being iterated, so a whole
+    menu can be encoded with ``JSONEncoder.iterencode`` without holding every
+    node in memory. The first item is serialized up front, in order to tell
+    whether the list is empty. The list can only be iterated once.
+    """
+
+    def __init__(self, iterable):
+        super(LazyList, self).__init__()
+        self.iterator = iter(iterable)
+        self.head = []
+        for item in self.iterator:
+            self.head.append(item)
+            break
+
+    def __iter__(self):
+        for item in self.head:
+            yield item
+        for item in self.iterator:
+            yield item
+
+    def __len__(self):
+        # Only tells whether the list is empty.
+        return len(self.head)
+
+    def __bool__(self):
+        return bool(self.head)
+
+    __nonzero__ = __bool__
+
+
+class StreamingNavigationNodeSerializer(FastNavigationNodeSerializer):
+    """
+    Serializes ``NavigationNodes`` into ``LazyLists`` for streaming.
+    """
+
+    def serialize_nodes(self, nodes, depth=0):
+        return LazyList(self.to_representation(node, depth) for node in nodes)
+
+
+class StreamingFlatNavigationNodeSerializer(StreamingNavigationNodeSerializer, FastFlatNavigationNodeSerializer):
+    """
+    Serializes ``FlatNodes`` into a ``LazyList`` for streaming.
+    """
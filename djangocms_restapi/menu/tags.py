@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import re
+from django.template import Template
+from django.utils import six
+
+from ..conf import get_setting
+from ..utils import LRUCache
+
+
+template_cache = LRUCache(maxsize=get_setting("MENU_TEMPLATE_CACHE_SIZE"))
+
+
+def format_argument(value):
+    """
+    Formats a single template tag argument. Strings are quoted, and
+    curly braces are stripped so they can't terminate the tag.
+    """
+    if value is None:
+        return "None"
+    if isinstance(value, six.string_types):
+        value = re.sub(r"[{}]", "", value).replace("\\", "\\\\").replace('"', '\\"')
+        return '"%s"' % value
+    return six.text_type(value)
+
+
+def get_tag_template(tag_name, args):
+    """
+    Returns a compiled ``Template`` which calls the menu tag ``tag_name``
+    with ``args``. Templates are cached by the normalized argument tuple.
+    """
+    args = tuple(args)
+
+    def compile_template():
+        return Template("".join((
+            "{% load menu_tags %}{% ", tag_name, " ",
+            " ".join(format_argument(arg) for arg in args), " %}"
+        )))
+
+    return template_cache.get_or_set((tag_name,) + args, compile_template)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+logger = logging.getLogger("djangocms_restapi.menu")
+
+
+@contextmanager
+def null_measure():
+    yield
+
+
+class CountingCursorWrapper(object):
+    """
+    Wraps a database cursor, adding the number of queries it runs and the
+    time spent running them to a ``Timing``. Unlike the debug cursor, the
+    SQL of the queries isn't kept.
+    """
+
+    def __init__(self, cursor, timing):
+        self.cursor = cursor
+        self.timing = timing
+
+    def __getattr__(self, attr):
+        return getattr(self.cursor, attr)
+
+    def __iter__(self):
+        return iter(self.cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        return self.cursor.__exit__(type, value, traceback)
+
+    def execute(self, sql, params=None):
+        started = time.time()
+        try:
+            return self.cursor.execute(sql, params)
+        finally:
+            self.timing.add_query(time.time() - started)
+
+    def executemany(self, sql, param_list):
+        started = time.time()
+        try:
+            return self.cursor.executemany(sql, param_list)
+        finally:
+            self.timing.add_query(time.time() - started)
+
+
+class Timing(object):
+    """
+    Records the time spent in each phase of a menu request, together with
+    the number of SQL queries and the time spent running them.
+    """
+
+    def __init__(self):
+        self.phases = OrderedDict()
+        self.queries = 0
+        self.sql = 0
+        self.total = None
+
+    def add_query(self, duration):
+        self.queries += 1
+        self.sql += duration
+
+    def wrap_cursor(self, make_cursor):
+        def wrapper(cursor):
+            return CountingCursorWrapper(make_cursor(cursor), self)
+        return wrapper
+
+    def start(self):
+        self.started = time.time()
+        # The cursors of the connection of this thread are wrapped until the
+        # timing is stopped, whether or not queries are logged.
+        connection.make_cursor = self.wrap_cursor(connection.make_cursor)
+        connection.make_debug_cursor = self.wrap_cursor(connection.make_debug_cursor)
+
+    def stop(self):
+        """
+        Stops the timing, unless it has been stopped already.
+        """
+        if self.total is not None:
+            return
+        del connection.make_cursor
+        del connection.make_debug_cursor
+        self.total = time.time() - self.started
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        # The cursors are restored even when the request fails.
+        self.stop()
+
+    @contextmanager
+    def measure(self, name):
+        """
+        Adds the time spent in the block to the phase ``name``.
+        """
+        started = time.time()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0) + time.time() - started
+
+    def get_metrics(self):
+        """
+        Returns an ordered dict with the number of queries, and the
+        durations in milliseconds.
+        """
+        metrics = OrderedDict()
+        metrics["queries"] = self.queries
+        metrics["sql"] = self.sql * 1000
+        for name, duration in self.phases.items():
+            metrics[name] = duration * 1000
+        metrics["total"] = self.total * 1000
+        return metrics
+
+    def get_header(self):
+        """
+        Returns the value of the ``Server-Timing`` header.
+        """
+        metrics = self.get_metrics()
+        entries = ['sql;dur=%.1f;desc="%d queries"' % (metrics.pop("sql"), metrics.pop("queries"))]
+        entries.extend("%s;dur=%.1f" % (name, duration) for name, duration in metrics.items())
+        return ", ".join(entries)
+
+    def log(self, request, response):
+        metrics = self.get_metrics()
+        logger.info(
+            "%s %s %s %s", request.method, request.get_full_path(), response.status_code,
+            " ".join("%s=%s" % (name, value if name == "queries" else "%.1fms" % value)
+                     for name, value in metrics.items()),
+            extra={"menu_timing": metrics}
+        )
@@ -4,7 +4,9 @@ from __future__ import absolute_import, unicode_literals
 
 from django.conf.urls import include, patterns, url
 from rest_framework import routers
-from .views import ShowMenuViewSet, ShowMenuBelowIdViewSet, ShowSubMenuViewSet, ShowBreadcrumbViewSet
+from .views import (
+    BatchMenuViewSet, BulkMenuViewSet, NodeViewSet, ShowMenuViewSet, ShowMenuBelowIdViewSet, ShowSubMenuViewSet, ShowBreadcrumbViewSet
+)
 
 
 router = routers.DefaultRouter()
@@ -12,6 +14,9 @@ router.register(r"show-menu", ShowMenuViewSet, base_name="show-menu")
 router.register(r"show-menu-below-id", ShowMenuBelowIdViewSet, base_name="show-menu-below-id")
 router.register(r"show-submenu", ShowSubMenuViewSet, base_name="show-submenu")
 router.register(r"show-breadcrumb", ShowBreadcrumbViewSet, base_name="show-breadcrumb")
+router.register(r"node", NodeViewSet, base_name="node")
+router.register(r"batch", BatchMenuViewSet, base_name="batch")
+router.register(r"bulk", BulkMenuViewSet, base_name="bulk")
 
 
 urlpatterns = patterns(
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import json
+from collections import OrderedDict
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from ..conf import get_setting
+from ..utils import LRUCache
+from . import cache as menu_cache
+from .renderers import EncodedJSON
+
+
+KEY_PREFIX = "djangocms_restapi:menu:version"
+
+# Serialized menus keyed by their version, used when no menu cache is configured.
+version_cache = LRUCache(maxsize=get_setting("MENU_VERSION_CACHE_SIZE"))
+
+
+def normalize(data):
+    """
+    Returns the serialized menu as plain data, decoding pre-encoded JSON.
+    """
+    if isinstance(data, EncodedJSON):
+        return json.loads(data.decode("utf-8"), object_pairs_hook=OrderedDict)
+    return data
+
+
+def get_version(data):
+    """
+    Returns the content version of the serialized menu ``data``.
+    """
+    content = json.dumps(data, cls=JSONEncoder, sort_keys=True, separators=(",", ":"))
+    return hashlib.md5(content.encode("utf-8")).hexdigest()
+
+
+def save(data):
+    """
+    Stores the serialized menu ``data`` and returns its version. The menus are
+    kept in the menu cache if one is configured, or in memory otherwise.
+    Versions are content hashes, so a menu is only stored when its version
+    isn't already.
+    """
+    data = normalize(data)
+    version = get_version(data)
+    cache = menu_cache.get_cache()
+    if cache is not None:
+        key = "%s:%s" % (KEY_PREFIX, version)
+        if not cache.has_key(key):
+            cache.add(key, data, get_setting("MENU_CACHE_TIMEOUT"))
+    elif version_cache.get(version) is None:
+        version_cache.set(version, data)
+    return version
+
+
+def load(version):
+    """
+    Returns the serialized menu with ``version``, or ``None`` if it's no
+    longer stored.
+    """
+    cache = menu_cache.get_cache()
+    if cache is not None:
+        return cache.get("%s:%s" % (KEY_PREFIX, version))
+    return version_cache.get(version)
+
+
+def get_key(node):
+    return "%s:%s" % (node.get("namespace") or "", node["id"])
+
+
+def flatten(nodes):
+    """
+    Returns an ``OrderedDict`` of ``(parent key, position, node)`` tuples
+    keyed by the namespace and id of each node, where the children of the
+    node are left out. Returns ``None`` if the nodes can't be told apart.
+    """
+    ret = OrderedDict()
+    stack = [(None, position, node) for position, node in reversed(list(enumerate(nodes)))]
+    while stack:
+        parent, position, node = stack.pop()
+        if not isinstance(node, dict) or "id" not in node:
+            return None
+        key = get_key(node)
+        if key in ret:
+            return None
+        value = OrderedDict(node)
+        children = value.get("children")
+        if isinstance(children, list):
+            value["children"] = []
+            stack.extend((key, position, child) for position, child in reversed(list(enumerate(children))))
+        ret[key] = (parent, position, value)
+    return ret
+
+
+def diff(old, new):
+    """
+    Returns a list of JSON-Patch style operations turning the serialized
+    nodes ``old`` into ``new``, or ``None`` if they can't be compared.
+    Every operation is keyed by the ``/<namespace>:<id>`` path of a node, and
+    added and replaced nodes carry their ``parent`` and ``position`` among
+    their siblings. Nodes are given without their children.
+    """
+    old_nodes, new_nodes = flatten(old), flatten(new)
+    if old_nodes is None or new_nodes is None:
+        return None
+
+    ops = [OrderedDict((("op", "remove"), ("path", "/" + key))) for key in old_nodes if key not in new_nodes]
+    for key, entry in new_nodes.items():
+        if old_nodes.get(key) == entry:
+            continue
+        parent, position, value = entry
+        ops.append(OrderedDict((
+            ("op", "replace" if key in old_nodes else "add"),
+            ("path", "/" + key),
+            ("parent", parent),
+            ("position", position),
+            ("value", value),
+        )))
+    return ops
+
+
+def apply(old, ops):
+    """
+    Returns the serialized nodes produced by applying the operations of
+    ``diff`` to ``old``.
+    """
+    nodes = flatten(old)
+    for op in ops:
+        key = op["path"][1:]
+        if op["op"] == "remove":
+            nodes.pop(key, None)
+        else:
+            nodes[key] = (op["parent"], op["position"], op["value"])
+
+    children = {}
+    for key, (parent, position, value) in nodes.items():
+        children.setdefault(parent, []).append((position, key))
+
+    def build(parent):
+        ret = []
+        for position, key in sorted(children.get(parent, [])):
+            node = OrderedDict(nodes[key][2])
+            if isinstance(node.get("children"), list):
+                node["children"] = build(key)
+            ret.append(node)
+        return ret
+
+    return build(None)
@@ -3,16 +3,40 @@
 from __future__ import absolute_import, unicode_literals
 
 import re
-from django.template import Template
-from django.template.context import Context
+from collections import OrderedDict
 
-from rest_framework.request import clone_request
+from django.http import HttpResponse, QueryDict, StreamingHttpResponse
+from django.template.context import Context
+from django.utils import six
+from django.utils.cache import cc_delim_re, patch_vary_headers
+from django.utils.http import urlencode
+
+from rest_framework import serializers, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request, clone_request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import GenericViewSet
 
 from cms.middleware.page import CurrentPageMiddleware
 
-from .serializers import NavigationNodeSerializer
+from ..conf import get_setting
+from ..utils import get_integer
+from . import cache as menu_cache, compression, conditional, engine, index, resolver, versions
+from .fragments import FragmentEncoder
+from .nodes import flatten_nodes
+from .renderers import CompactMenuRenderer, MenuJSONRenderer
+from .serializers import (
+    FastFlatNavigationNodeSerializer, FastNavigationNodeSerializer, FlatNavigationNodeSerializer,
+    NavigationNodeSerializer, StreamingFlatNavigationNodeSerializer, StreamingNavigationNodeSerializer, parse_fields
+)
+from .tags import get_tag_template
+from .timing import Timing, null_measure
+
+
+# Response header carrying the content version of the menu.
+VERSION_HEADER = "X-Menu-Version"
 
 
 class CurrentPageAPIContextMixin(CurrentPageMiddleware):
@@ -21,19 +45,45 @@ class CurrentPageAPIContextMixin(CurrentPageMiddleware):
     The request clone is ran through the ``CurrentPageMiddleware``
     before returned.
     """
+    timing = None
+
     def __init__(self, *args, **kwargs):
         super(CurrentPageAPIContextMixin, self).__init__(*args, **kwargs)
         self.context = Context()
 
-    def get_context(self, request):
-        request = clone_request(request, request.method)
+    def measure(self, name):
+        """
+        Returns a context manager which measures the time spent in the
+        phase ``name`` when timing is enabled.
+        """
+        if self.timing is None:
+            return null_measure()
+        return self.timing.measure(name)
 
-        if "current_page" in request.GET:
-            # Runs through regex in order to clean up potential double quoted strings.
-            request.path = request.path_info = re.sub(r'^"|"$', '', request.GET["current_page"])
+    def get_page_request(self, request, path=None):
+        """
+        Returns a clone of the request for ``path``, which has been ran
+        through the ``CurrentPageMiddleware``.
+        """
+        with self.measure("page"):
+            request = clone_request(request, request.method)
+            if path is not None:
+                # Runs through regex in order to clean up potential double quoted strings.
+                request.path = request.path_info = re.sub(r'^"|"$', '', path)
+
+            self.process_request(request)
+            resolver.resolve_page(request)
+            if self.timing is not None:
+                # Resolve the page right away, so it's not measured as part of the menu.
+                bool(request.current_page)
+        return request
+
+    def get_context(self, request):
+        if "request" in self.context:
+            # The page has already been resolved for this request.
+            return self.context
 
-        self.process_request(request)
-        self.context["request"] = request
+        self.context["request"] = self.get_page_request(request, request.GET.get("current_page"))
         return self.context
 
 
@@ -58,28 +108,143 @@ class ShowMenuViewSet(CurrentPageAPIContextMixin, GenericViewSet):
     namespace (str):        The namespace of the menu. If blank, all namespaces will be used.
     current_page (str):     URL for the page that should be considered the `current_page` \n
                             when rendering the context.
+    layout (str):           Use ``layout=flat`` to get a flat list of the nodes in pre-order, \n
+                            with a ``depth`` and a ``position`` among the siblings, instead \n
+                            of nested ``children``.
+    fields (str):           Comma separated list of the node fields to return, e.g. \n
+                            ``id,title,url,selected``. Attributes are given as \n
+                            ``attrs.<name>``. ``children`` are kept unless excluded.
+    exclude (str):          Comma separated list of the node fields to leave out.
+    max_depth (int):        Number of levels of nodes to return, e.g. ``2`` for the root \n
+                            nodes and their children.
+    stream (bool):          Use ``stream=1`` to stream the JSON while the nodes are being \n
+                            serialized, instead of building the whole response in memory.
+    since (str):            Version of the menu, as given by a previous ``X-Menu-Version`` \n
+                            header, to return the changes since instead of the whole \n
+                            menu. Only used when ``MENU_VERSIONS`` is enabled.
     =====================   ================================================================
     """
 
+    renderer_classes = [
+        MenuJSONRenderer if renderer is JSONRenderer else renderer
+        for renderer in api_settings.DEFAULT_RENDERER_CLASSES
+    ] + [CompactMenuRenderer]
     serializer_class = NavigationNodeSerializer
+    flat_serializer_class = FlatNavigationNodeSerializer
+    tag_name = "show_menu"
+    menu_backend = None
+    menu_serializer = None
+    params = None
 
-    def render_context(self, context):
+    def get_tag_arguments(self, params):
         """
-        Render and return the context
+        Returns the normalized argument tuple for the template tag.
+        """
+        return (
+            get_integer(params, "start_level", 0),
+            get_integer(params, "end_level", 100),
+            get_integer(params, "extra_inactive", 0),
+            get_integer(params, "extra_active", 1000),
+            "menu/menu.html",
+            params.get("namespace", ""),
+        )
+
+    def get_params(self):
+        """
+        Returns the query parameters describing the menu. These are the
+        query parameters of the request, unless ``params`` has been given.
         """
-        args = ("{start_level} {end_level} {extra_inactive} "
-                "{extra_active} {template} {namespace}").format(
-            start_level=self.request.GET.get("start_level", 0),
-            end_level=self.request.GET.get("end_level", 100),
-            extra_inactive=self.request.GET.get("extra_inactive", 0),
-            extra_active=self.request.GET.get("extra_active", 1000),
-            template='"menu/menu.html"',
-            namespace='"%s"' % self.request.GET.get("namespace", ""),
+        return self.request.GET if self.params is None else self.params
+
+    def is_flat(self):
+        """
+        Returns ``True`` if the nodes should be returned as a flat list.
+        """
+        return self.get_params().get("layout") == "flat"
+
+    def get_max_depth(self):
+        """
+        Returns the number of levels of nodes to return, or ``None``
+        for all of them.
+        """
+        max_depth = get_integer(self.get_params(), "max_depth", None)
+        return max_depth if max_depth is not None and max_depth > 0 else None
+
+    def is_sparse(self):
+        """
+        Returns ``True`` if only some of the fields or levels of the nodes
+        are requested.
+        """
+        params = self.get_params()
+        return bool(
+            parse_fields(params.get("fields")) or parse_fields(params.get("exclude")) or
+            self.get_max_depth() is not None
         )
-        template = Template(
-            "".join(("{% load menu_tags %}{% show_menu ", args, " %}"))
+
+    def get_serializer_context(self):
+        context = super(ShowMenuViewSet, self).get_serializer_context()
+        params = self.get_params()
+        context.update({
+            "fields": parse_fields(params.get("fields")),
+            "exclude": parse_fields(params.get("exclude")),
+            "max_depth": self.get_max_depth(),
+        })
+        return context
+
+    def get_menu_serializer(self):
+        """
+        Returns the name of the serializer used for the nodes, either
+        ``"rest_framework"`` or ``"fast"``.
+        """
+        return self.menu_serializer or get_setting("MENU_SERIALIZER")
+
+    def use_streaming(self):
+        """
+        Returns ``True`` if the JSON should be streamed while the nodes
+        are being serialized. Menus embedded in other responses, which have
+        been given ``params``, are never streamed.
+        """
+        return (
+            self.params is None and self.get_params().get("stream") in serializers.BooleanField.TRUE_VALUES and
+            isinstance(self.request.accepted_renderer, MenuJSONRenderer)
+        )
+
+    def get_serializer_class(self):
+        if self.use_streaming():
+            return StreamingFlatNavigationNodeSerializer if self.is_flat() else StreamingNavigationNodeSerializer
+        fast = self.get_menu_serializer() == "fast"
+        if self.is_flat():
+            return FastFlatNavigationNodeSerializer if fast else self.flat_serializer_class
+        return FastNavigationNodeSerializer if fast else self.serializer_class
+
+    def use_fragments(self):
+        """
+        Returns ``True`` if the response should be spliced together from
+        pre-encoded node fragments. Indented JSON and sparse nodes are
+        always rendered.
+        """
+        renderer = self.request.accepted_renderer
+        return (
+            get_setting("MENU_FRAGMENTS") and isinstance(renderer, MenuJSONRenderer) and
+            renderer.get_indent(self.request.accepted_media_type, {}) is None and not self.is_sparse()
         )
-        template.render(context)
+
+    def get_menu_backend(self):
+        """
+        Returns the name of the backend used to build the menu, either
+        ``"template"`` or ``"direct"``.
+        """
+        return self.menu_backend or get_setting("MENU_BACKEND")
+
+    def render_context(self, context):
+        """
+        Render and return the context
+        """
+        args = self.get_tag_arguments(self.get_params())
+        if self.get_menu_backend() == "direct":
+            context.update(engine.TAGS[self.tag_name](context["request"], *args))
+        else:
+            get_tag_template(self.tag_name, args).render(context)
         return context
 
     def get_queryset(self):
@@ -89,14 +254,213 @@ class ShowMenuViewSet(CurrentPageAPIContextMixin, GenericViewSet):
         context = self.render_context(self.get_context(self.request))
         return context["children"]
 
+    def get_cache_key(self):
+        """
+        Returns the key the response is cached under, or ``None`` if
+        the response shouldn't be cached.
+        """
+        if self.request.user.is_staff:
+            # Staff members may be looking at draft pages.
+            return None
+        request = self.get_context(self.request)["request"]
+        return menu_cache.make_key(menu_cache.get_cache(), self.request.path, self.request.GET,
+                                   self.request.accepted_media_type, request)
+
+    def get_validators(self):
+        """
+        Returns the ``(etag, last_modified)`` validators of the response,
+        or ``None`` if conditional requests aren't supported.
+        """
+        if not get_setting("MENU_CONDITIONAL_GET") or self.request.user.is_staff:
+            return None
+        return conditional.get_validators(self.request.path, self.request.GET, self.request)
+
+    def get_data(self):
+        """
+        Returns the serialized menu, from the cache if possible.
+        """
+        cache = menu_cache.get_cache()
+        cache_key = self.get_cache_key() if cache is not None else None
+        if cache_key is not None:
+            data = cache.get(cache_key)
+            if data is not None:
+                return data
+
+        data = self.build_data()
+        if cache_key is not None:
+            cache.set(cache_key, data, get_setting("MENU_CACHE_TIMEOUT"))
+        return data
+
+    def use_encoded_response(self):
+        """
+        Returns ``True`` if the response is served from the precompressed
+        variants of the rendered menu in the cache.
+        """
+        return (
+            menu_cache.get_cache() is not None and isinstance(self.request.accepted_renderer, JSONRenderer) and
+            not self.request.user.is_staff
+        )
+
+    def get_content_encoding(self):
+        """
+        Returns the content coding the client would get the menu in, or
+        ``None`` if it would get the identity. Compressed variants which
+        turn out not to be smaller than the menu aren't known beforehand.
+        """
+        if not self.use_encoded_response():
+            return None
+        encodings = get_setting("MENU_CACHE_ENCODINGS")
+        variants = [compression.IDENTITY] + compression.get_available_encodings(encodings)
+        encoding = compression.choose_encoding(self.request, variants, encodings)
+        return encoding if encoding != compression.IDENTITY else None
+
+    def get_encoded_response(self):
+        """
+        Returns a response with the rendered menu from the cache, in the
+        precompressed variant the client accepts, or ``None`` if the response
+        shouldn't be cached. Only JSON responses are cached rendered, as other
+        renderers may depend on the response they render.
+        """
+        if not self.use_encoded_response():
+            return None
+        cache = menu_cache.get_cache()
+        renderer = self.request.accepted_renderer
+        cache_key = self.get_cache_key()
+        if cache_key is None:
+            return None
+
+        encodings = get_setting("MENU_CACHE_ENCODINGS")
+        entry = cache.get(cache_key)
+        if entry is None:
+            data = self.build_data()
+            content = renderer.render(data, self.request.accepted_media_type, self.get_renderer_context())
+            if isinstance(content, six.text_type):
+                content = content.encode(renderer.charset)
+            version = versions.save(data) if self.use_versions() else None
+            entry = (compression.compress(content, encodings), version)
+            cache.set(cache_key, entry, get_setting("MENU_CACHE_TIMEOUT"))
+        variants, version = entry
+
+        encoding = compression.choose_encoding(self.request, variants, encodings)
+        content_type = self.request.accepted_media_type
+        if renderer.charset is not None:
+            content_type = "%s; charset=%s" % (content_type, renderer.charset)
+        response = HttpResponse(variants[encoding], content_type=content_type)
+        if encoding != compression.IDENTITY:
+            response["Content-Encoding"] = encoding
+        if version is not None:
+            response[VERSION_HEADER] = version
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
+    def use_versions(self):
+        """
+        Returns ``True`` if the response should carry its content version.
+        """
+        return get_setting("MENU_VERSIONS")
+
+    def get_versioned_response(self):
+        """
+        Returns a response with the serialized menu and its content version.
+        If the client gives the version it already has with ``since``, and
+        that version is still stored, only the changes since are returned.
+        """
+        data = versions.normalize(self.get_data())
+        version = versions.save(data)
+        since = self.get_params().get("since")
+        old = versions.load(since) if since else None
+        ops = versions.diff(old, data) if old is not None else None
+        if ops is None:
+            response = Response(data)
+        else:
+            response = Response(OrderedDict((("version", version), ("since", since), ("patch", ops))))
+        response[VERSION_HEADER] = version
+        return response
+
+    def get_nodes(self):
+        """
+        Returns the nodes of the menu, flattened if requested.
+        """
+        nodes = self.filter_queryset(self.get_queryset())
+        if self.is_flat():
+            nodes = flatten_nodes(nodes, self.get_max_depth())
+            if not self.use_streaming():
+                nodes = list(nodes)
+        return nodes
+
+    def build_data(self):
+        """
+        Builds and serializes the menu.
+        """
+        # Resolve the page first, so it's not measured as part of the menu.
+        self.get_context(self.request)
+        with self.measure("menu"):
+            nodes = self.get_nodes()
+        with self.measure("serialize"):
+            if self.use_fragments():
+                # Staff members may be looking at draft pages.
+                encoder = FragmentEncoder(self.request.accepted_renderer, use_cache=not self.request.user.is_staff)
+                return encoder.encode(nodes)
+            return self.get_serializer(nodes, many=True).data
+
+    def get_streaming_response(self):
+        """
+        Returns a response which streams the menu while it's being
+        serialized. Streamed menus are never cached.
+        """
+        self.get_context(self.request)
+        with self.measure("menu"):
+            nodes = self.get_nodes()
+        renderer = self.request.accepted_renderer
+        content = renderer.render_chunks(
+            self.get_serializer(nodes, many=True).data, self.request.accepted_media_type,
+            self.get_renderer_context()
+        )
+        return StreamingHttpResponse(content, content_type=self.request.accepted_media_type)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not get_setting("MENU_TIMING"):
+            return super(ShowMenuViewSet, self).dispatch(request, *args, **kwargs)
+        with Timing() as self.timing:
+            return super(ShowMenuViewSet, self).dispatch(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # REST framework replaces the Vary header, so the headers set by the view are added back.
+        vary = cc_delim_re.split(response["Vary"]) if response.has_header("Vary") else ()
+        response = super(ShowMenuViewSet, self).finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, vary)
+        if self.timing is not None:
+            if isinstance(response, Response):
+                with self.measure("render"):
+                    response.render()
+            self.timing.stop()
+            response["Server-Timing"] = self.timing.get_header()
+            self.timing.log(request, response)
+        return response
+
     def list(self, request, *args, **kwargs):
         """
         Serialize and return the queryset. The menu list
         are never paginated.
         """
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        validators = self.get_validators()
+        encoding = None
+        if validators is not None and conditional.is_not_modified(request, *validators):
+            # Neither resolve the page nor build the menu if the client is up to date.
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            encoding = self.get_content_encoding()
+        elif self.use_streaming():
+            response = self.get_streaming_response()
+        elif self.use_versions() and "since" in self.get_params():
+            response = self.get_versioned_response()
+        else:
+            response = self.get_encoded_response()
+            if response is None:
+                response = self.get_versioned_response() if self.use_versions() else Response(self.get_data())
+
+        if validators is not None:
+            conditional.set_validators(response, *validators, encoding=encoding)
+        return response
 
 
 class ShowMenuBelowIdViewSet(ShowMenuViewSet):
@@ -122,26 +486,17 @@ class ShowMenuBelowIdViewSet(ShowMenuViewSet):
     current_page (str):     URL for the page that should be considered the `current_page` \n
                             when rendering the context.
     =====================   ================================================================
+
+    The output parameters of ``ShowMenuViewSet`` (``layout``, ``fields``, ``exclude``,
+    ``max_depth``, ``stream`` and ``since``) are supported as well.
     """
-    def render_context(self, context):
+    tag_name = "show_menu_below_id"
+
+    def get_tag_arguments(self, params):
         """
-        Render and return the context
+        Returns the normalized argument tuple for the template tag.
         """
-        args = ("{root_id} {start_level} {end_level} {extra_inactive} "
-                "{extra_active} {template} {namespace}").format(
-            root_id='"%s"' % self.request.GET.get("root_id", ""),
-            start_level=self.request.GET.get("start_level", 0),
-            end_level=self.request.GET.get("end_level", 100),
-            extra_inactive=self.request.GET.get("extra_inactive", 0),
-            extra_active=self.request.GET.get("extra_active", 1000),
-            template='"menu/menu.html"',
-            namespace='"%s"' % self.request.GET.get("namespace", "")
-        )
-        template = Template(
-            "".join(("{% load menu_tags %}{% show_menu_below_id ", args, " %}"))
-        )
-        template.render(context)
-        return context
+        return (params.get("root_id", ""),) + super(ShowMenuBelowIdViewSet, self).get_tag_arguments(params)
 
 
 class ShowSubMenuViewSet(ShowMenuViewSet):
@@ -162,22 +517,21 @@ class ShowSubMenuViewSet(ShowMenuViewSet):
     current_page (str):     URL for the page that should be considered the `current_page` \n
                             when rendering the context.
     =====================   ================================================================
+
+    The output parameters of ``ShowMenuViewSet`` (``layout``, ``fields``, ``exclude``,
+    ``max_depth``, ``stream`` and ``since``) are supported as well.
     """
-    def render_context(self, context):
+    tag_name = "show_sub_menu"
+
+    def get_tag_arguments(self, params):
         """
-        Constructs the template tag arguments and render it.
-        Returns the context.
+        Returns the normalized argument tuple for the template tag.
         """
-        args = "{levels} {root_level} {nephews}".format(
-            levels=self.request.GET.get("levels", 100),
-            root_level=self.request.GET.get("root_level", None),
-            nephews=self.request.GET.get("nephews", 100)
-        )
-        template = Template(
-            "".join(("{% load menu_tags %}{% show_sub_menu ", args, " %}"))
+        return (
+            get_integer(params, "levels", 100),
+            get_integer(params, "root_level", None),
+            get_integer(params, "nephews", 100),
         )
-        template.render(context)
-        return context
 
 
 class ShowBreadcrumbViewSet(ShowMenuViewSet):
@@ -197,28 +551,247 @@ class ShowBreadcrumbViewSet(ShowMenuViewSet):
     current_page (str):     URL for the page that should be considered the `current_page` \n
                             when rendering the context.
     =====================   ================================================================
+
+    The output parameters of ``ShowMenuViewSet`` (``layout``, ``fields``, ``exclude``,
+    ``max_depth``, ``stream`` and ``since``) are supported as well.
     """
+    tag_name = "show_breadcrumb"
 
     def get_queryset(self):
         context = self.render_context(self.get_context(self.request))
 
         # We don't want nested children in the breadcrumb context.
-        # This should be a flat structure.
+        # This should be a flat structure. The nodes are copies made for
+        # this request, so the shared trees are left untouched.
         for node in context["ancestors"]:
             del node.children
 
         return context["ancestors"]
 
-    def render_context(self, context):
+    def get_tag_arguments(self, params):
+        """
+        Returns the normalized argument tuple for the template tag.
+        """
+        return (get_integer(params, "start_level", 0),)
+
+
+class NodeViewSet(ShowMenuViewSet):
+    """
+    API Endpoint which returns a single ``NavigationNode`` and its subtree,
+    e.g. for loading the submenus of a mega menu on demand. The node is
+    looked up in an index of the node tree, which is built once for every
+    version of the page tree instead of building the menu on each request.
+
+    =====================   ================================================================
+    Query parameters        Description
+    =====================   ================================================================
+    id (int):               Specify the ID of the node, e.g. the ID of its page.
+    reverse_id (str):       Specify the ``reverse_id`` of the page of the node, instead \n
+                            of its ID.
+    namespace (str):        The namespace of the node with ``id``. Defaults to ``CMSMenu``.
+    current_page (str):     URL for the page that should be considered the `current_page` \n
+                            when marking the nodes as selected, ancestors, descendants \n
+                            or siblings.
+    layout (str):           Use ``layout=flat`` to get a flat list of the node and its \n
+                            descendants in pre-order, with a ``depth`` and a ``position`` \n
+                            among the siblings, instead of nested ``children``.
+    fields (str):           Comma separated list of the node fields to return, e.g. \n
+                            ``id,title,url,selected``. Attributes are given as \n
+                            ``attrs.<name>``. ``children`` are kept unless excluded.
+    exclude (str):          Comma separated list of the node fields to leave out.
+    max_depth (int):        Number of levels of nodes to return, e.g. ``2`` for the node \n
+                            and its children.
+    =====================   ================================================================
+    """
+
+    def use_fragments(self):
+        return False
+
+    def use_streaming(self):
+        return False
+
+    def get_node(self, node_index):
+        """
+        Returns the node of ``node_index`` requested by ``id`` or ``reverse_id``.
+        """
+        params = self.get_params()
+        if not params.get("id") and not params.get("reverse_id"):
+            raise ValidationError({"id": ["Either \"id\" or \"reverse_id\" is required."]})
+        node = node_index.get(get_integer(params, "id", None), params.get("reverse_id"),
+                         params.get("namespace") or "CMSMenu")
+        if node is None:
+            raise NotFound()
+        return node
+
+    def get_cache_key(self):
+        if self.request.user.is_staff:
+            return None
+        return menu_cache.make_node_key(menu_cache.get_cache(), self.request.path, self.request.GET,
+                                        self.request.accepted_media_type, conditional.get_tree_key(self.request))
+
+    def get_queryset(self):
         """
-        Constructs the template tag arguments and render it.
-        Returns the context.
+        Returns a list with a copy of the requested node and its subtree.
         """
-        args = "{start_level}".format(
-            start_level=self.request.GET.get("start_level", 0)
+        node_index = index.get_index(self.request)
+        path = self.get_params().get("current_page")
+        if path is not None:
+            # Runs through regex in order to clean up potential double quoted strings.
+            path = re.sub(r'^"|"$', '', path)
+        return [index.get_subtree(node_index, self.get_node(node_index), self.get_max_depth(), path)]
+
+    def build_data(self):
+        # The current page is only needed to mark the nodes, so it's never resolved.
+        with self.measure("menu"):
+            nodes = self.get_nodes()
+        with self.measure("serialize"):
+            if self.is_flat():
+                return self.get_serializer(nodes, many=True).data
+            return self.get_serializer(nodes[0]).data
+
+
+class BatchMenuViewSet(ShowMenuViewSet):
+    """
+    API Endpoint which returns several named menus for the same `current_page`
+    in one response. The current page is resolved and the node tree is built
+    once, and shared between all the menus.
+
+    =====================   ================================================================
+    Query parameters        Description
+    =====================   ================================================================
+    menus (str):            Comma separated list of ``name:endpoint`` pairs, where the \n
+                            endpoint is ``show-menu``, ``show-menu-below-id``, \n
+                            ``show-submenu`` or ``show-breadcrumb``.
+    <name>.<param>:         Query parameter ``param`` of the endpoint for the menu ``name``, \n
+                            e.g. ``main.extra_inactive=100``.
+    current_page (str):     URL for the page that should be considered the `current_page` \n
+                            when rendering the context.
+    =====================   ================================================================
+    """
+    viewsets = {
+        "show-menu": ShowMenuViewSet,
+        "show-menu-below-id": ShowMenuBelowIdViewSet,
+        "show-submenu": ShowSubMenuViewSet,
+        "show-breadcrumb": ShowBreadcrumbViewSet,
+    }
+
+    default_menus = ""
+
+    def get_specs(self):
+        """
+        Returns a list of ``(name, viewset class, params)`` tuples for the
+        requested menus.
+        """
+        params = self.get_params()
+        specs = []
+        for spec in filter(None, params.get("menus", self.default_menus).split(",")):
+            name, _, endpoint = spec.partition(":")
+            if endpoint not in self.viewsets:
+                raise ValidationError({"menus": ["Unknown endpoint \"%s\" for menu \"%s\"." % (endpoint, name)]})
+
+            prefix = name + "."
+            spec_params = QueryDict("", mutable=True)
+            for key, values in params.lists():
+                if key.startswith(prefix):
+                    spec_params.setlist(key[len(prefix):], values)
+            specs.append((name, self.viewsets[endpoint], spec_params))
+        return specs
+
+    def use_fragments(self):
+        return False
+
+    def use_streaming(self):
+        return False
+
+    def use_versions(self):
+        return False
+
+    def get_menu_data(self, viewset_class, request, params):
+        """
+        Returns the serialized menu of ``viewset_class`` for ``request``, the
+        request clone which has been ran through the ``CurrentPageMiddleware``.
+        """
+        # The menus are always built with the direct backend, which
+        # builds the node tree only once for the shared request.
+        view = viewset_class(
+            request=self.request, args=self.args, kwargs=self.kwargs, format_kwarg=self.format_kwarg,
+            menu_backend="direct", menu_serializer=self.menu_serializer, params=params
         )
-        template = Template(
-            "".join(("{% load menu_tags %}{% show_breadcrumb ", args, " %}"))
+        view.context = Context({"request": request})
+        return view.get_serializer(view.get_nodes(), many=True).data
+
+    def build_data(self):
+        request = self.get_context(self.request)["request"]
+        return OrderedDict(
+            (name, self.get_menu_data(viewset_class, request, params))
+            for name, viewset_class, params in self.get_specs()
         )
-        template.render(context)
-        return context
+
+
+class BulkMenuViewSet(BatchMenuViewSet):
+    """
+    API Endpoint which returns the menus of many pages at once, e.g. for
+    prerendering. The node tree is built once, and only the selection state
+    is computed for each page. The pages may be given as query parameters,
+    or as a ``pages`` list in the body of a ``POST`` request.
+
+    =====================   ================================================================
+    Query parameters        Description
+    =====================   ================================================================
+    pages (str):            URL of a page to return the menus for. May be repeated.
+    menus (str):            Comma separated list of ``name:endpoint`` pairs, where the \n
+                            endpoint is ``show-menu``, ``show-menu-below-id``, \n
+                            ``show-submenu`` or ``show-breadcrumb``. Defaults to \n
+                            ``menu:show-menu,breadcrumb:show-breadcrumb``.
+    <name>.<param>:         Query parameter ``param`` of the endpoint for the menu ``name``, \n
+                            e.g. ``menu.extra_inactive=100``.
+    =====================   ================================================================
+    """
+    default_menus = "menu:show-menu,breadcrumb:show-breadcrumb"
+
+    def get_pages(self):
+        """
+        Returns the list of page URLs to return the menus for.
+        """
+        if self.request.method == "POST":
+            return list(self.request.data.get("pages", []))
+        return self.get_params().getlist("pages")
+
+    def iter_menus(self, pages):
+        """
+        Yields the menus of each page in ``pages``.
+        """
+        specs = self.get_specs()
+        nodes = None
+        for page in pages:
+            request = self.get_page_request(self.request, page)
+            if nodes is not None:
+                request._menu_nodes = nodes
+            menus = OrderedDict(
+                (name, self.get_menu_data(viewset_class, request, params))
+                for name, viewset_class, params in specs
+            )
+            nodes = getattr(request, "_menu_nodes", None)
+            yield OrderedDict((("current_page", page), ("menus", menus)))
+
+    def build_data(self):
+        return list(self.iter_menus(self.get_pages()))
+
+    def create(self, request, *args, **kwargs):
+        """
+        Returns the menus of the pages listed in the request body.
+        """
+        return Response(self.build_data())
+
+
+def get_bulk_menus(request, pages, params=None):
+    """
+    Yields the menus of each page in ``pages``, like the bulk endpoint.
+    ``request`` must have a ``user`` and a ``session``, and ``params`` is a
+    dict with the query parameters describing the menus.
+    """
+    if not isinstance(request, Request):
+        request = Request(request)
+    params = QueryDict(urlencode(params or {}, doseq=True))
+    view = BulkMenuViewSet(request=request, args=(), kwargs={}, format_kwarg=None, params=params)
+    return view.iter_menus(pages)
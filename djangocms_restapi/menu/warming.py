@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import logging
+import threading
+from multiprocessing.pool import ThreadPool
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import translation
+
+from cms.models import Page
+from cms.utils.i18n import get_public_languages
+
+from ..conf import get_setting
+from . import cache as menu_cache
+from .handler import get_menu_response
+
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pool = None
+# Ids of the pages whose menus are queued for warming, but not being warmed yet.
+_pending = set()
+# Pages published inside a transaction on Django versions without
+# ``transaction.on_commit``, queued once the request has finished.
+_deferred = threading.local()
+
+
+def get_pages(page):
+    """
+    Returns the public ``page``, its ancestors and its siblings.
+    """
+    pages = list(page.get_ancestors().filter(publisher_is_draft=False))
+    pages.extend(page.get_siblings().filter(publisher_is_draft=False))
+    if page not in pages:
+        pages.append(page)
+    return pages
+
+
+def get_page_urls(page_id, site_id):
+    """
+    Returns a list of ``(language, url)`` tuples for the public page with
+    ``page_id``, its ancestors and its siblings, in every language they're
+    published in.
+    """
+    page = Page.objects.public().filter(pk=page_id).first()
+    if page is None:
+        return []
+    page_ids = [related.pk for related in get_pages(page)]
+
+    urls = []
+    for language in get_public_languages(site_id):
+        with translation.override(language):
+            pages = Page.objects.public().published(language=language, site=site_id).filter(
+                pk__in=page_ids).order_by("path")
+            urls.extend((language, related.get_absolute_url(language=language)) for related in pages)
+    return urls
+
+
+def warm_menu(endpoint, params, current_page):
+    """
+    Requests the menu endpoint for ``current_page`` as an anonymous user,
+    which stores the response in the menu cache. Returns the status code.
+    """
+    return get_menu_response(endpoint, params, current_page).status_code
+
+
+def warm_page(page_id, site_id):
+    """
+    Warms the cached menus of the page with ``page_id``, its ancestors and
+    its siblings. Returns the number of menus warmed.
+    """
+    with _lock:
+        # Publishing the page again from now on queues it again.
+        _pending.discard(page_id)
+
+    count = 0
+    try:
+        for language, url in get_page_urls(page_id, site_id):
+            with translation.override(language):
+                for endpoint, params in get_setting("MENU_CACHE_WARMING_MENUS"):
+                    warm_menu(endpoint, params, url)
+                    count += 1
+    except Exception:
+        logger.exception("Failed to warm the menus of page %s", page_id)
+    return count
+
+
+def warm_page_in_thread(page_id, site_id):
+    """
+    Runs ``warm_page`` on a worker thread, closing the database connections
+    of the thread afterwards.
+    """
+    try:
+        return warm_page(page_id, site_id)
+    finally:
+        for connection in connections.all():
+            connection.close()
+
+
+def get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPool(get_setting("MENU_CACHE_WARMING_WORKERS"))
+        return _pool
+
+
+def queue_page(page_id, site_id):
+    """
+    Queues warming the menus of the page with ``page_id`` on the background
+    thread pool, unless it's queued already. The menus are warmed right
+    away in the synchronous mode.
+    """
+    if get_setting("MENU_CACHE_WARMING_SYNC"):
+        return warm_page(page_id, site_id)
+
+    with _lock:
+        if page_id in _pending:
+            return None
+        _pending.add(page_id)
+    get_pool().apply_async(warm_page_in_thread, (page_id, site_id))
+
+
+def is_enabled():
+    """
+    Returns ``True`` if the cached menus should be warmed after publishing.
+    """
+    return get_setting("MENU_CACHE_WARMING") and menu_cache.get_cache() is not None
+
+
+def queue_deferred():
+    """
+    Queues the pages whose warming was deferred until the transaction they
+    were published in has been committed.
+    """
+    pages = getattr(_deferred, "pages", None)
+    if not pages:
+        return
+    _deferred.pages = []
+    for page_id, site_id in pages:
+        queue_page(page_id, site_id)
+
+
+def warm_after_publish(page):
+    """
+    Warms the cached menus affected by publishing the public ``page``. Only
+    the pages of the current site are warmed. The menus are queued once the
+    transaction is committed, so the workers never read the tree before the
+    publish. Django versions without ``transaction.on_commit`` queue the
+    pages published inside a transaction when the request has finished, and
+    pages published inside a transaction outside of a request, e.g. by a
+    management command, are queued by the next request of the thread.
+    """
+    if not is_enabled() or page.site_id != settings.SITE_ID:
+        return
+
+    def queue():
+        queue_page(page.pk, page.site_id)
+
+    if get_setting("MENU_CACHE_WARMING_SYNC"):
+        queue()
+    elif hasattr(transaction, "on_commit"):
+        transaction.on_commit(queue)
+    elif transaction.get_connection().in_atomic_block:
+        if not hasattr(_deferred, "pages"):
+            _deferred.pages = []
+        _deferred.pages.append((page.pk, page.site_id))
+    else:
+        queue()
+
@@ -2,31 +2,57 @@
 
 from __future__ import absolute_import, unicode_literals
 
+import re
 from datetime import datetime, timedelta
+
 from cms.middleware.page import get_page
 
+from .conf import get_setting
+
 
 class CurrentPageCookieMiddleWare(object):
     """
     Sets the `current_page` in the Cookie Store.
+
+    Only successful responses with one of the ``CURRENT_PAGE_COOKIE_CONTENT_TYPES``
+    outside of the ``CURRENT_PAGE_COOKIE_EXCLUDED_PATHS`` are considered, so
+    static files, API calls and the like never look up the current page. The
+    page is stored in the session as well, which is saved once for the whole
+    response by the ``SessionMiddleware``. This middleware must therefore be
+    listed after the ``SessionMiddleware``.
     """
 
+    def is_page_response(self, request, response):
+        """
+        Returns ``True`` if ``response`` may be a rendered CMS page.
+        """
+        if response.status_code != 200 or getattr(response, "streaming", False):
+            return False
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type not in get_setting("CURRENT_PAGE_COOKIE_CONTENT_TYPES"):
+            return False
+        return not any(re.match(pattern, request.path_info) for pattern in
+                       get_setting("CURRENT_PAGE_COOKIE_EXCLUDED_PATHS"))
+
     def process_response(self, request, response):
-        current_page = getattr(request, "current_page", get_page(request))
+        if not self.is_page_response(request, response):
+            return response
+
+        # Only looked up if the CurrentPageMiddleware hasn't set it.
+        current_page = request.current_page if hasattr(request, "current_page") else get_page(request)
         if current_page:
             # Only update do this if we're on a "cms page"!
             current_page = current_page.get_absolute_url()
 
-            if hasattr(request, "session"):
-                session_page = request.session.get("current_page", None)
-                if not session_page == current_page:
-                    request.session["current_language"] = current_page
-                    request.session.save()
+            session = getattr(request, "session", None)
+            if session is not None and session.get("current_page", None) != current_page:
+                # Saved by the SessionMiddleware once the response is done.
+                session["current_page"] = current_page
 
             if "current_page" in request.COOKIES and request.COOKIES["current_page"] == current_page:
                 return response
 
-            max_age = 365 * 24 * 60 * 60  # 10 years
+            max_age = 365 * 24 * 60 * 60  # 1 year
             expires = datetime.utcnow() + timedelta(seconds=max_age)
             response.set_cookie("current_page", current_page, expires=expires)
             return response
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import threading
+from collections import OrderedDict
+
+
+_missing = object()
+
+
+def get_integer(params, name, default):
+    """
+    Returns the query parameter ``name`` as an integer, or ``default``
+    if it's missing or not a valid integer.
+    """
+    try:
+        return int(params[name])
+    except (KeyError, TypeError, ValueError):
+        return default
+
+
+class LRUCache(object):
+    """
+    A thread safe mapping which holds at most ``maxsize`` items, discarding
+    the least recently used item when full. Hits and misses are counted
+    in order to be able to tell whether the cache is sized correctly.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            # Re-insert the item in order to mark it as the most recently used.
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, factory):
+        """
+        Returns the cached value for ``key``. On a miss, ``factory`` is
+        called without holding the lock and its return value is cached.
+        """
+        value = self.get(key, _missing)
+        if value is _missing:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def info(self):
+        """
+        Returns a dict with the hit and miss counters and the current size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "maxsize": self.maxsize,
+            "currsize": len(self._data),
+        }
@@ -27,6 +27,9 @@ setup(
         "djangorestframework-recursive>=0.1.1",
         "django-cms>=3.1.0"
     ],
+    extras_require={
+        "brotli": ["brotli"],
+    },
     tests_require=[
         "nose",
         "mock",
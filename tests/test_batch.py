@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import mock
+
+from django.core.urlresolvers import reverse
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+from menus.menu_pool import menu_pool
+
+from .test_menus import BaseAPITestCase
+
+
+class BatchMenuViewSetTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def setUp(self):
+        super(BatchMenuViewSetTestCase, self).setUp()
+        self.url = reverse("batch-list")
+
+    def get_data(self, url_name, **data):
+        response = self.client.get(reverse(url_name), data=data, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_same_output_as_endpoints(self):
+        p1 = self.get_page("p1")
+        p1.reverse_id = "p1"
+        p1.save()
+
+        data = {
+            "menus": "main:show-menu,below:show-menu-below-id,sub:show-submenu,crumbs:show-breadcrumb,flat:show-menu",
+            "current_page": "/p9/p10/",
+            "main.extra_inactive": 100,
+            "below.root_id": "p1",
+            "sub.root_level": 1,
+            "flat.layout": "flat",
+        }
+        response = self.client.get(self.url, data=data, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data.keys()), ["main", "below", "sub", "crumbs", "flat"])
+
+        current_page = data["current_page"]
+        self.assertEqual(response.data["main"],
+                         self.get_data("show-menu-list", current_page=current_page, extra_inactive=100))
+        self.assertEqual(response.data["below"],
+                         self.get_data("show-menu-below-id-list", current_page=current_page, root_id="p1"))
+        self.assertEqual(response.data["sub"],
+                         self.get_data("show-submenu-list", current_page=current_page, root_level=1))
+        self.assertEqual(response.data["crumbs"],
+                         self.get_data("show-breadcrumb-list", current_page=current_page))
+        self.assertEqual(response.data["flat"],
+                         self.get_data("show-menu-list", current_page=current_page, layout="flat"))
+
+    def test_nodes_are_built_once(self):
+        data = {"menus": "main:show-menu,sub:show-submenu,crumbs:show-breadcrumb", "current_page": "/p2/"}
+        with mock.patch.object(menu_pool, "_build_nodes", wraps=menu_pool._build_nodes) as build_nodes:
+            response = self.client.get(self.url, data=data, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(build_nodes.call_count, 1)
+
+    def test_unknown_endpoint(self):
+        response = self.client.get(self.url, data={"menus": "main:show-everything"}, format="json")
+        self.assertEqual(response.status_code, 400)
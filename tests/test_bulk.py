@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.urlresolvers import reverse
+from django.test import RequestFactory
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+from menus.menu_pool import menu_pool
+
+from djangocms_restapi.menu.views import get_bulk_menus
+
+from .test_menus import BaseAPITestCase
+
+
+class BulkMenuViewSetTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    pages = ["/", "/p2/p3/", "/p4/", "/p9/p10/"]
+
+    def setUp(self):
+        super(BulkMenuViewSetTestCase, self).setUp()
+        self.url = reverse("bulk-list")
+
+    def assertSameAsEndpoints(self, results, **menu_params):
+        self.assertEqual([result["current_page"] for result in results], self.pages)
+        for result in results:
+            data = dict(menu_params, current_page=result["current_page"])
+            menu = self.client.get(reverse("show-menu-list"), data=data, format="json").data
+            breadcrumb = self.client.get(reverse("show-breadcrumb-list"), data=data, format="json").data
+            self.assertEqual(result["menus"]["menu"], menu)
+            self.assertEqual(result["menus"]["breadcrumb"], breadcrumb)
+
+    def test_get(self):
+        response = self.client.get(self.url, data={"pages": self.pages}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertSameAsEndpoints(response.data)
+
+    def test_post(self):
+        response = self.client.post(self.url, data={"pages": self.pages}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertSameAsEndpoints(response.data)
+
+    def test_python_api(self):
+        request = RequestFactory().get("/")
+        request.session = {}
+        request.user = AnonymousUser()
+        with mock.patch.object(menu_pool, "_build_nodes", wraps=menu_pool._build_nodes) as build_nodes:
+            results = list(get_bulk_menus(request, self.pages, {"menu.extra_inactive": "100"}))
+        self.assertEqual(build_nodes.call_count, 1)
+        self.assertSameAsEndpoints(results, extra_inactive=100)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import gzip
+import io
+import json
+
+import mock
+
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import RequestFactory, SimpleTestCase
+from django.test.utils import override_settings
+
+from cms.api import create_page
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from djangocms_restapi.menu import compression
+
+from .test_menus import BaseAPITestCase
+
+
+def get_data(response):
+    return json.loads(response.content.decode("utf-8"))
+
+
+@override_settings(DJANGOCMS_RESTAPI_MENU_CACHE="default")
+class MenuCacheTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def setUp(self):
+        super(MenuCacheTestCase, self).setUp()
+        cache.clear()
+        self.url = reverse("show-menu-list")
+
+    def test_cached_response(self):
+        response = self.client.get(self.url, data={"current_page": "/p2/"}, format="json")
+        # Only the current page is resolved, the menu isn't built again.
+        with self.assertNumQueries(2):
+            cached = self.client.get(self.url, data={"current_page": "/p2/"}, format="json")
+        self.assertEqual(cached.content, response.content)
+
+    def test_key_includes_current_page(self):
+        first = self.client.get(self.url, data={"current_page": "/p2/"}, format="json")
+        second = self.client.get(self.url, data={"current_page": "/p4/"}, format="json")
+        self.assertFalse(get_data(first)[1]["selected"])
+        self.assertTrue(get_data(second)[1]["selected"])
+
+    def test_publish_invalidates(self):
+        response = self.client.get(self.url, format="json")
+        self.assertEqual(len(get_data(response)), 2)
+
+        page = create_page("P12", "nav_playground.html", "en", in_navigation=True, published=False)
+        page.publish("en")
+        response = self.client.get(self.url, format="json")
+        self.assertEqual(len(get_data(response)), 3)
+
+        page.unpublish("en")
+        response = self.client.get(self.url, format="json")
+        self.assertEqual(len(get_data(response)), 2)
+
+    def test_precompressed_variants(self):
+        data = {"current_page": "/p2/", "extra_inactive": 100}
+        identity = self.client.get(self.url, data=data, format="json")
+        self.assertNotIn("Content-Encoding", identity)
+        self.assertIn("Accept-Encoding", identity["Vary"])
+
+        response = self.client.get(self.url, data=data, format="json", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        with gzip.GzipFile(fileobj=io.BytesIO(response.content)) as f:
+            self.assertEqual(f.read(), identity.content)
+
+        response = self.client.get(self.url, data=data, format="json", HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertNotIn("Content-Encoding", response)
+
+    @mock.patch.object(compression, "brotli", None)
+    def test_brotli_fallback(self):
+        data = {"current_page": "/p2/", "extra_inactive": 100}
+        response = self.client.get(self.url, data=data, format="json", HTTP_ACCEPT_ENCODING="br, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+
+class CompressionTestCase(SimpleTestCase):
+
+    def choose(self, accept_encoding, variants=("identity", "gzip", "br")):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return compression.choose_encoding(request, variants)
+
+    def test_choose_encoding(self):
+        self.assertEqual(self.choose("gzip, deflate, br"), "br")
+        self.assertEqual(self.choose("gzip, br;q=0.5"), "gzip")
+        self.assertEqual(self.choose("gzip, br", ("identity", "gzip")), "gzip")
+        self.assertEqual(self.choose("*"), "br")
+        self.assertEqual(self.choose("br;q=0, gzip;q=0"), "identity")
+        self.assertEqual(self.choose(""), "identity")
+
+    def test_compress(self):
+        content = b"[" + b",".join([b'{"namespace":"CMSMenu"}'] * 20) + b"]"
+        brotli = mock.Mock(compress=lambda content: b"br")
+        with mock.patch.object(compression, "brotli", brotli):
+            self.assertEqual(compression.compress(content, ("br", "gzip"))["br"], b"br")
+        with mock.patch.object(compression, "brotli", None):
+            variants = compression.compress(content, ("br", "gzip"))
+        self.assertEqual(sorted(variants), ["gzip", "identity"])
+        self.assertEqual(compression.compress(b"[]", ("gzip",)), {"identity": b"[]"})
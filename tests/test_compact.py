@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+
+from django.core.urlresolvers import reverse
+from django.test import SimpleTestCase
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from djangocms_restapi.menu.compact import decode, pack, unpack
+from djangocms_restapi.menu.nodes import flatten_nodes
+from djangocms_restapi.menu.renderers import CompactMenuRenderer
+from djangocms_restapi.menu.serializers import FastFlatNavigationNodeSerializer, FastNavigationNodeSerializer
+
+from .test_menus import BaseAPITestCase
+from .test_serializers import make_node
+
+
+class CompactTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.root = make_node(1, ancestor=True, menu_level=0, is_leaf_node=False)
+        child = make_node(2, self.root, selected=True, menu_level=1)
+        make_node(3, child, descendant=1, is_leaf_node=True)
+        make_node(4, self.root, sibling=True)
+        self.other = make_node(5)
+        self.other.children = None
+        self.nodes = [self.root, self.other]
+
+    def round_trip(self, data):
+        return decode(CompactMenuRenderer().render(data))
+
+    def test_round_trip(self):
+        data = FastNavigationNodeSerializer(self.nodes, many=True).data
+        self.assertEqual(self.round_trip(data), data)
+
+    def test_round_trip_flat(self):
+        data = FastFlatNavigationNodeSerializer(list(flatten_nodes(self.nodes)), many=True).data
+        self.assertEqual(self.round_trip(data), data)
+
+    def test_round_trip_nested(self):
+        menu = FastNavigationNodeSerializer(self.nodes, many=True).data
+        data = [
+            {"current_page": "/", "menus": {"menu": menu, "breadcrumb": []}},
+            {"current_page": "/node-2/", "menus": {"menu": menu[:1], "breadcrumb": menu[1:]}},
+        ]
+        self.assertEqual(self.round_trip(data), data)
+        self.assertEqual(self.round_trip({"detail": "Not found."}), {"detail": "Not found."})
+
+    def test_table(self):
+        table = pack(FastNavigationNodeSerializer(self.nodes, many=True).data)
+        self.assertEqual(table["fields"][:3], ["id", "title", "url"])
+        self.assertIn("children", table["fields"])
+        # Pre-order, with the number of children in place of the children.
+        self.assertEqual([row[0] for row in table["rows"]], [1, 2, 3, 4, 5])
+        self.assertEqual([row[-1] for row in table["rows"]], [2, 1, 0, 0, None])
+        self.assertEqual(table["strings"][0], "CMSMenu")
+        self.assertIn("namespace", table["interned"])
+        self.assertNotIn("id", table["interned"])
+        self.assertEqual(unpack(json.loads(json.dumps(table))), FastNavigationNodeSerializer(self.nodes, many=True).data)
+
+
+class CompactRendererTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def test_same_data(self):
+        requests = [
+            ("show-menu-list", {"extra_inactive": 100}),
+            ("show-menu-list", {"layout": "flat"}),
+            ("show-submenu-list", {}),
+            ("show-breadcrumb-list", {}),
+            ("batch-list", {"menus": "menu:show-menu,breadcrumb:show-breadcrumb"}),
+            ("bulk-list", {"pages": ["/", "/p2/p3/"]}),
+        ]
+        for url_name, data in requests:
+            data = dict(data, current_page="/p2/p3/")
+            expected = self.client.get(reverse(url_name), data=data, format="json")
+            response = self.client.get(reverse(url_name), data=data, HTTP_ACCEPT=CompactMenuRenderer.media_type)
+            self.assertEqual(response["Content-Type"], CompactMenuRenderer.media_type)
+            self.assertEqual(decode(response.content), json.loads(expected.content.decode("utf-8")))
+            self.assertLessEqual(len(response.content), len(expected.content))
+
+    def test_format_parameter(self):
+        response = self.client.get(reverse("show-menu-list"), data={"format": "compact"})
+        self.assertEqual(response["Content-Type"], CompactMenuRenderer.media_type)
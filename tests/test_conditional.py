@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
+from django.utils.http import http_date
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from .test_menus import BaseAPITestCase
+
+
+@override_settings(DJANGOCMS_RESTAPI_MENU_CONDITIONAL_GET=True)
+class ConditionalGetTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def setUp(self):
+        super(ConditionalGetTestCase, self).setUp()
+        self.url = reverse("show-menu-list")
+
+    def test_etag(self):
+        response = self.client.get(self.url, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+        other = self.client.get(self.url, data={"current_page": "/p2/"}, format="json")
+        self.assertNotEqual(other["ETag"], response["ETag"])
+
+    def test_if_none_match(self):
+        etag = self.client.get(self.url, format="json")["ETag"]
+        # Only the state of the page tree is looked up.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+        response = self.client.get(self.url, format="json", HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url, format="json")["Last-Modified"]
+        response = self.client.get(self.url, format="json", HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["Last-Modified"], last_modified)
+
+        response = self.client.get(self.url, format="json", HTTP_IF_MODIFIED_SINCE=http_date(0))
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_none_match_takes_precedence(self):
+        # Deleting a page doesn't change the newest modification date of the
+        # tree, only the ETag tells the menus apart.
+        data = {"extra_inactive": 100}
+        response = self.client.get(self.url, data=data, format="json")
+        self.assertIn("P5", response.content.decode("utf-8"))
+        self.get_page("p5").delete()
+        response = self.client.get(self.url, data=data, format="json", HTTP_IF_NONE_MATCH=response["ETag"],
+                                   HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("P5", response.content.decode("utf-8"))
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_CACHE="default")
+    def test_encoded_variants(self):
+        cache.clear()
+        identity = self.client.get(self.url, format="json")["ETag"]
+        response = self.client.get(self.url, format="json", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["ETag"], identity[:-1] + '-gzip"')
+
+        response = self.client.get(self.url, format="json", HTTP_ACCEPT_ENCODING="gzip",
+                                   HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], identity[:-1] + '-gzip"')
+        response = self.client.get(self.url, format="json", HTTP_IF_NONE_MATCH=identity)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], identity)
+        response = self.client.get(self.url, format="json", HTTP_IF_NONE_MATCH=identity[:-1] + '-stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_page_changes_update_etag(self):
+        etag = self.client.get(self.url, format="json")["ETag"]
+        self.get_page("p5").delete()
+        response = self.client.get(self.url, format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_CONDITIONAL_GET=False)
+    def test_disabled(self):
+        response = self.client.get(self.url, format="json")
+        self.assertNotIn("ETag", response)
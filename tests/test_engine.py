@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.urlresolvers import reverse
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture, SoftrootFixture
+from menus.base import Modifier, NavigationNode
+from menus.menu_pool import menu_pool
+
+from djangocms_restapi.menu import engine
+from djangocms_restapi.menu.nodes import CompactNode
+
+from .test_menus import BaseAPITestCase
+
+
+class EngineComparisonMixin(object):
+    """
+    Asserts that the "direct" menu backend returns exactly the same
+    data as the "template" backend.
+    """
+
+    def get_data(self, backend, url_name, data):
+        with override_settings(DJANGOCMS_RESTAPI_MENU_BACKEND=backend):
+            response = self.client.get(reverse(url_name), data=data, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def assertSameOutput(self, url_name, **data):
+        self.assertEqual(
+            self.get_data("direct", url_name, data),
+            self.get_data("template", url_name, data)
+        )
+
+
+class ExtendedMenusEngineTestCase(EngineComparisonMixin, ExtendedMenusFixture, BaseAPITestCase):
+
+    def test_show_menu(self):
+        for current_page in ("/", "/p2/", "/p4/", "/p9/p10/"):
+            self.assertSameOutput("show-menu-list", current_page=current_page)
+            self.assertSameOutput("show-menu-list", current_page=current_page, start_level=1,
+                                  end_level=1, extra_inactive=0, extra_active=100)
+            self.assertSameOutput("show-menu-list", current_page=current_page, start_level=0,
+                                  end_level=100, extra_inactive=0, extra_active=1)
+
+    def test_show_menu_below_id(self):
+        p1 = self.get_page("p1")
+        p1.reverse_id = "p1"
+        p1.save()
+
+        for current_page in ("/", "/p9/p10/"):
+            self.assertSameOutput("show-menu-below-id-list", root_id="p1", current_page=current_page)
+        self.assertSameOutput("show-menu-below-id-list", root_id="missing")
+
+    def test_show_submenu(self):
+        for current_page in ("/", "/p2/", "/p9/"):
+            self.assertSameOutput("show-submenu-list", current_page=current_page)
+            self.assertSameOutput("show-submenu-list", current_page=current_page, levels=1)
+            self.assertSameOutput("show-submenu-list", current_page=current_page, root_level=1,
+                                  nephews=1)
+            self.assertSameOutput("show-submenu-list", current_page=current_page, root_level=0)
+
+    def test_show_breadcrumb(self):
+        for current_page in ("/", "/p2/p3/", "/p6/p7/"):
+            self.assertSameOutput("show-breadcrumb-list", current_page=current_page)
+            self.assertSameOutput("show-breadcrumb-list", current_page=current_page, start_level=1)
+
+
+class SoftrootEngineTestCase(EngineComparisonMixin, SoftrootFixture, BaseAPITestCase):
+
+    def test_show_menu(self):
+        for soft_root in (False, True):
+            root = self.get_page("root")
+            root.soft_root = soft_root
+            root.save()
+
+            for slug in ("top", "root", "aaa", "ccc", "444"):
+                current_page = self.get_page(slug).get_absolute_url()
+                self.assertSameOutput("show-menu-list", current_page=current_page, extra_inactive=0,
+                                      extra_active=100)
+                self.assertSameOutput("show-submenu-list", current_page=current_page)
+                self.assertSameOutput("show-breadcrumb-list", current_page=current_page)
+
+
+class EngineNodesTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def get_request(self):
+        request = RequestFactory().get("/p2/")
+        request.user = AnonymousUser()
+        request.session = {}
+        return request
+
+    def test_compact_nodes(self):
+        request = self.get_request()
+        nodes = engine.get_nodes(request)
+        self.assertTrue(all(isinstance(node, CompactNode) for node in request._menu_nodes))
+        self.assertEqual(len(nodes), len(request._menu_nodes))
+        self.assertTrue(any(node.selected for node in nodes))
+        self.assertFalse(any(getattr(node, "selected", False) for node in request._menu_nodes))
+
+    def test_unknown_modifiers(self):
+        class CustomModifier(Modifier):
+            def modify(self, request, nodes, namespace, root_id, post_cut, breadcrumb):
+                for node in nodes:
+                    node.custom = True
+                return nodes
+
+        menu_pool.discover_menus()
+        with mock.patch.object(menu_pool, "modifiers", menu_pool.modifiers + [CustomModifier]):
+            request = self.get_request()
+            nodes = engine.get_nodes(request)
+        self.assertTrue(all(isinstance(node, NavigationNode) for node in request._menu_nodes))
+        self.assertTrue(all(node.custom for node in nodes))
+
+    def get_state(self, nodes):
+        return [
+            (node.id, getattr(node, "selected", None), getattr(node, "ancestor", None),
+             getattr(node, "descendant", None), getattr(node, "sibling", None), getattr(node, "level", None),
+             getattr(node, "menu_level", None), getattr(node, "is_leaf_node", None), node.parent,
+             tuple(node.children))
+            for node in nodes
+        ]
+
+    def test_request_tree_is_never_mutated(self):
+        request = self.get_request()
+        engine.get_nodes(request)
+        state = self.get_state(request._menu_nodes)
+        engine.show_menu(request, 0, 100, 0, 100)
+        engine.show_menu_below_id(request, "p9")
+        engine.show_sub_menu(request, 1)
+        engine.show_breadcrumb(request)
+        self.assertEqual(self.get_state(request._menu_nodes), state)
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_BACKEND="direct")
+    def test_shared_tree_is_never_mutated(self):
+        engine.tree_cache.clear()
+        self.addCleanup(engine.tree_cache.clear)
+        with mock.patch.object(engine, "is_partitioned", return_value=True):
+            self.client.get(reverse("show-menu-list"), format="json")
+            nodes, = engine.tree_cache._data.values()
+            state = self.get_state(nodes)
+            for url_name, data in (("show-menu-list", {"extra_inactive": 100}),
+                                   ("show-menu-below-id-list", {"root_id": "p9"}),
+                                   ("show-submenu-list", {}), ("show-breadcrumb-list", {})):
+                for current_page in ("/", "/p2/p3/", "/p9/p10/", "/p4/"):
+                    response = self.client.get(reverse(url_name), data=dict(data, current_page=current_page),
+                                               format="json")
+                    self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(engine.tree_cache), 1)
+        self.assertEqual(self.get_state(nodes), state)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
+from django.utils.six import StringIO
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from .test_menus import BaseAPITestCase
+
+
+class ExportMenusTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def setUp(self):
+        super(ExportMenusTestCase, self).setUp()
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(ExportMenusTestCase, self).tearDown()
+        shutil.rmtree(self.output_dir)
+
+    def read(self, *path):
+        with open(os.path.join(self.output_dir, "1", "en", *path), "rb") as f:
+            return f.read()
+
+    def test_export(self):
+        p1 = self.get_page("p1")
+        p1.reverse_id = "p1"
+        p1.save()
+
+        stdout = StringIO()
+        call_command("export_menus", self.output_dir, gzip=True, stdout=stdout)
+        # 11 pages, each with 4 menus.
+        self.assertEqual(stdout.getvalue().strip(), "Exported 44 menus.")
+
+        for path in ("/", "/p2/p3/", "/p9/p10/p11/"):
+            for endpoint in ("show-menu", "show-submenu", "show-breadcrumb"):
+                content = self.client.get(reverse("%s-list" % endpoint), data={"current_page": path}).content
+                file_path = (endpoint,) + tuple(filter(None, path.split("/"))) + ("index.json",)
+                self.assertEqual(self.read(*file_path), content)
+
+            content = self.client.get(reverse("show-menu-below-id-list"),
+                                      data={"current_page": path, "root_id": "p1"}).content
+            file_path = ("show-menu-below-id", "p1") + tuple(filter(None, path.split("/"))) + ("index.json",)
+            self.assertEqual(self.read(*file_path), content)
+
+        with gzip.open(os.path.join(self.output_dir, "1", "en", "show-menu", "index.json.gz"), "rb") as f:
+            self.assertEqual(f.read(), self.read("show-menu", "index.json"))
+
+    def test_endpoint_option(self):
+        call_command("export_menus", self.output_dir, endpoints=["show-breadcrumb"], stdout=StringIO())
+        self.assertEqual(os.listdir(os.path.join(self.output_dir, "1", "en")), ["show-breadcrumb"])
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_CACHE="default", DJANGOCMS_RESTAPI_MENU_FRAGMENTS=True)
+    def test_same_code_path(self):
+        cache.clear()
+        call_command("export_menus", self.output_dir, endpoints=["show-menu"], stdout=StringIO())
+        # The menus were exported through the cache, like the API serves them.
+        with self.assertNumQueries(2):
+            content = self.client.get(reverse("show-menu-list"), data={"current_page": "/p2/"}).content
+        self.assertEqual(self.read("show-menu", "p2", "index.json"), content)
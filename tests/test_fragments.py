@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+
+import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
+
+from cms.middleware.toolbar import ToolbarMiddleware
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from djangocms_restapi.menu import cache as menu_cache
+from djangocms_restapi.menu.fragments import fragment_cache
+
+from .test_menus import BaseAPITestCase
+
+
+class FragmentTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def setUp(self):
+        super(FragmentTestCase, self).setUp()
+        fragment_cache.clear()
+
+    def get_content(self, url_name, **data):
+        with override_settings(DJANGOCMS_RESTAPI_MENU_FRAGMENTS=True):
+            return self.client.get(reverse(url_name), data=data, format="json").content
+
+    def test_same_output(self):
+        for url_name in ("show-menu-list", "show-submenu-list", "show-breadcrumb-list"):
+            for current_page in ("/", "/p2/p3/", "/p9/p10/"):
+                for layout in ("tree", "flat"):
+                    data = {"current_page": current_page, "layout": layout, "extra_inactive": 100}
+                    expected = self.client.get(reverse(url_name), data=data, format="json").content
+                    self.assertEqual(self.get_content(url_name, **data), expected)
+
+    def test_fragments_are_reused(self):
+        first = self.get_content("show-menu-list", current_page="/p2/")
+        self.assertIn(self.get_page("p2").pk, fragment_cache)
+        hits = fragment_cache.hits
+
+        second = json.loads(self.get_content("show-menu-list", current_page="/p4/").decode("utf-8"))
+        self.assertGreater(fragment_cache.hits, hits)
+        self.assertTrue(json.loads(first.decode("utf-8"))[0]["children"][0]["selected"])
+        self.assertFalse(second[0]["selected"])
+        self.assertTrue(second[1]["selected"])
+
+    def test_publish_invalidates_page_and_descendants(self):
+        self.get_content("show-menu-list", extra_inactive=100)
+        p2 = self.get_page("p2")
+        self.assertIn(p2.pk, fragment_cache)
+
+        draft = p2.publisher_public
+        title = draft.get_title_obj("en")
+        title.title = "Renamed"
+        title.save()
+        draft.publish("en")
+
+        self.assertNotIn(p2.pk, fragment_cache)
+        self.assertNotIn(self.get_page("p3").pk, fragment_cache)
+        self.assertIn(self.get_page("p4").pk, fragment_cache)
+        content = json.loads(self.get_content("show-menu-list", extra_inactive=100).decode("utf-8"))
+        self.assertEqual(content[0]["children"][0]["title"], "Renamed")
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_CACHE="default")
+    def test_generation_invalidates(self):
+        cache.clear()
+        self.get_content("show-menu-list")
+        p2 = self.get_page("p2")
+        title = p2.get_title_obj("en")
+        title.title = "Renamed"
+        title.save()
+
+        # Publishing in another process only bumps the shared generation.
+        menu_cache.invalidate()
+        self.assertIn(p2.pk, fragment_cache)
+        content = json.loads(self.get_content("show-menu-list").decode("utf-8"))
+        self.assertEqual(content[0]["children"][0]["title"], "Renamed")
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_FRAGMENT_TIMEOUT=0)
+    def test_timeout(self):
+        self.get_content("show-menu-list")
+        title = self.get_page("p2").get_title_obj("en")
+        title.title = "Renamed"
+        title.save()
+        content = json.loads(self.get_content("show-menu-list").decode("utf-8"))
+        self.assertEqual(content[0]["children"][0]["title"], "Renamed")
+
+    def test_staff_fragments_are_not_cached(self):
+        user = User.objects.create_user("staff", "staff@example.com", "staff")
+        user.is_staff = True
+        self.client.force_authenticate(user)
+        # The toolbar of staff members needs the admin log, which isn't installed.
+        with mock.patch.object(ToolbarMiddleware, "process_response", lambda self, request, response: response):
+            self.get_content("show-menu-list")
+        self.assertEqual(len(fragment_cache), 0)
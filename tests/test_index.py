@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from rest_framework import status
+
+from cms.api import create_page
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from djangocms_restapi.menu.index import index_cache
+
+from .test_menus import BaseAPITestCase
+
+
+def find_node(nodes, title):
+    for node in nodes:
+        if node["title"] == title:
+            return node
+        found = find_node(node.get("children") or [], title)
+        if found is not None:
+            return found
+
+
+def without_menu_level(node):
+    node = dict(node)
+    node.pop("menu_level", None)
+    node["children"] = [without_menu_level(child) for child in node.get("children") or []]
+    return node
+
+
+class NodeViewSetTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def setUp(self):
+        super(NodeViewSetTestCase, self).setUp()
+        index_cache.clear()
+        self.url = reverse("node-list")
+
+    def test_same_nodes_as_menu(self):
+        data = {"current_page": "/p2/p3/", "extra_inactive": 100}
+        menu = self.client.get(reverse("show-menu-list"), data=data, format="json").data
+        for title in ("P1", "P2", "P3", "P9", "P4"):
+            expected = find_node(menu, title)
+            response = self.client.get(self.url, data={"id": expected["id"], "current_page": "/p2/p3/"},
+                                       format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["menu_level"], 0)
+            self.assertEqual(without_menu_level(response.data), without_menu_level(expected))
+
+    def test_reverse_id(self):
+        page = self.get_page("p9").publisher_draft
+        page.reverse_id = "p9"
+        page.save()
+        page.publish("en")
+        response = self.client.get(self.url, data={"reverse_id": "p9"}, format="json")
+        self.assertEqual(response.data["title"], "P9")
+        self.assertEqual([child["title"] for child in response.data["children"]], ["P10"])
+        self.assertFalse(response.data["selected"])
+
+    def test_max_depth(self):
+        page = self.get_page("p1")
+        response = self.client.get(self.url, data={"id": page.pk, "max_depth": 2}, format="json")
+        self.assertEqual([child["title"] for child in response.data["children"]], ["P2", "P9"])
+        self.assertNotIn("children", response.data["children"][0])
+        self.assertFalse(response.data["children"][0]["is_leaf_node"])
+
+        response = self.client.get(self.url, data={"id": page.pk, "max_depth": 2, "layout": "flat"}, format="json")
+        self.assertEqual([(node["title"], node["depth"]) for node in response.data], [("P1", 0), ("P2", 1), ("P9", 1)])
+
+    def test_hidden_nodes(self):
+        hidden = create_page("P12", "nav_playground.html", "en", in_navigation=False, published=True,
+                             parent=self.get_page("p4").publisher_draft)
+        create_page("P13", "nav_playground.html", "en", in_navigation=True, published=True, parent=hidden)
+        data = {"current_page": "/p4/", "extra_inactive": 100}
+        menu = self.client.get(reverse("show-menu-list"), data=data, format="json").data
+        response = self.client.get(self.url, data={"id": self.get_page("p4").pk, "current_page": "/p4/"},
+                                   format="json")
+        self.assertEqual([child["title"] for child in response.data["children"]], ["P5"])
+        self.assertEqual(without_menu_level(response.data), without_menu_level(find_node(menu, "P4")))
+
+        # Nodes hidden from the navigation may still be looked up.
+        response = self.client.get(self.url, data={"id": self.get_page("p6").pk}, format="json")
+        self.assertEqual([child["title"] for child in response.data["children"]], ["P7", "P8"])
+
+    def test_missing_node(self):
+        response = self.client.get(self.url, data={"id": 12345}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.url, data={}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_index_is_shared(self):
+        page = self.get_page("p2")
+        self.client.get(self.url, data={"id": page.pk}, format="json")
+        self.assertEqual(len(index_cache), 1)
+        page = self.get_page("p9")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, data={"id": page.pk, "current_page": "/p2/"}, format="json")
+        self.assertEqual(response.data["title"], "P9")
+        self.assertTrue(response.data["sibling"])
+        self.assertEqual(len(index_cache), 1)
+        # Only the state of the page tree is looked up.
+        self.assertEqual(len(context.captured_queries), 1)
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_CACHE="default")
+    def test_cached_response(self):
+        cache.clear()
+        page = self.get_page("p9")
+        self.client.get(self.url, data={"id": page.pk}, format="json")
+        # The current page isn't resolved for the cache key either.
+        for data in ({"id": page.pk, "current_page": "/p2/"}, {"id": page.pk, "current_page": "/p2/"}):
+            with self.assertNumQueries(1):
+                response = self.client.get(self.url, data=data, format="json")
+            self.assertTrue(json.loads(response.content.decode("utf-8"))["sibling"])
+
+    def test_shared_tree_is_never_mutated(self):
+        def get_state(nodes):
+            return [
+                (node.id, node.selected, node.ancestor, node.descendant, node.sibling, node.parent,
+                 tuple(node.children), getattr(node, "menu_level", None))
+                for node in nodes
+            ]
+
+        self.client.get(self.url, data={"id": self.get_page("p1").pk}, format="json")
+        node_index, = index_cache._data.values()
+        state = get_state(node_index.nodes)
+
+        for data in ({"current_page": "/p2/p3/"}, {"current_page": "/p9/", "max_depth": 1},
+                     {"current_page": "/p4/", "layout": "flat"}):
+            for slug in ("p1", "p2", "p9", "p4"):
+                self.client.get(self.url, data=dict(data, id=self.get_page(slug).pk), format="json")
+        self.assertEqual(get_state(node_index.nodes), state)
+
+    def test_marks(self):
+        response = self.client.get(self.url, data={"id": self.get_page("p1").pk, "current_page": "/p2/"},
+                                   format="json")
+        p1 = response.data
+        p2, p9 = p1["children"]
+        p3 = p2["children"][0]
+        self.assertEqual((p1["ancestor"], p1["selected"]), (True, False))
+        self.assertEqual((p2["selected"], p2["sibling"]), (True, False))
+        self.assertEqual((p9["sibling"], p9["descendant"]), (True, False))
+        self.assertEqual((p3["descendant"], p3["menu_level"]), (True, 2))
+
+    def test_publish_invalidates(self):
+        page = self.get_page("p2")
+        self.client.get(self.url, data={"id": page.pk}, format="json")
+        self.assertEqual(len(index_cache), 1)
+        page.publisher_draft.publish("en")
+        self.assertEqual(len(index_cache), 0)
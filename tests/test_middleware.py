@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.cache import SessionStore
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from djangocms_restapi.middleware import CurrentPageCookieMiddleWare
+
+from .test_menus import BaseAPITestCase
+
+
+class CurrentPageCookieMiddleWareTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def setUp(self):
+        super(CurrentPageCookieMiddleWareTestCase, self).setUp()
+        self.middleware = CurrentPageCookieMiddleWare()
+
+    def get_request(self, path="/p2/"):
+        request = RequestFactory().get(path)
+        request.session = SessionStore()
+        request.user = AnonymousUser()
+        return request
+
+    def test_page_response(self):
+        request = self.get_request()
+        request.current_page = self.get_page("p2")
+        with mock.patch.object(request.session, "save") as save:
+            response = self.middleware.process_response(request, HttpResponse(content_type="text/html"))
+        self.assertEqual(response.cookies["current_page"].value, "/p2/")
+        self.assertEqual(request.session["current_page"], "/p2/")
+        self.assertTrue(request.session.modified)
+        # The session is saved by the SessionMiddleware.
+        self.assertFalse(save.called)
+
+    def test_unchanged_page(self):
+        request = self.get_request()
+        request.current_page = self.get_page("p2")
+        request.session["current_page"] = "/p2/"
+        request.session.modified = False
+        request.COOKIES["current_page"] = "/p2/"
+        response = self.middleware.process_response(request, HttpResponse(content_type="text/html"))
+        self.assertNotIn("current_page", response.cookies)
+        self.assertFalse(request.session.modified)
+
+    def test_non_page_responses(self):
+        responses = [
+            ("/p2/", HttpResponse(content_type="application/json")),
+            ("/p2/", HttpResponse(content_type="text/html", status=404)),
+            ("/admin/", HttpResponse(content_type="text/html")),
+        ]
+        with override_settings(DJANGOCMS_RESTAPI_CURRENT_PAGE_COOKIE_EXCLUDED_PATHS=(r"^/admin/",)):
+            for path, response in responses:
+                request = self.get_request(path)
+                with self.assertNumQueries(0):
+                    response = self.middleware.process_response(request, response)
+                self.assertNotIn("current_page", response.cookies)
+                self.assertNotIn("current_page", request.session)
+
+    def test_lookup(self):
+        request = self.get_request()
+        response = self.middleware.process_response(request, HttpResponse(content_type="text/html; charset=utf-8"))
+        self.assertEqual(response.cookies["current_page"].value, "/p2/")
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import copy
+import sys
+
+from django.core.urlresolvers import reverse
+from django.test import SimpleTestCase
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+from menus.base import NavigationNode
+
+from djangocms_restapi.menu.nodes import NodeOverlay, compact_nodes, copy_nodes, flatten_nodes
+from djangocms_restapi.menu.serializers import (
+    FastFlatNavigationNodeSerializer, FastNavigationNodeSerializer, NavigationNodeSerializer
+)
+
+from .test_menus import BaseAPITestCase
+from .test_serializers import make_node
+
+
+class FlattenNodesTestCase(SimpleTestCase):
+
+    def test_pre_order(self):
+        root = NavigationNode("root", "/", 1)
+        first = NavigationNode("first", "/first/", 2, 1)
+        second = NavigationNode("second", "/second/", 3, 1)
+        grandchild = NavigationNode("grandchild", "/first/grandchild/", 4, 2)
+        root.children = [first, second]
+        first.children = [grandchild]
+        other = NavigationNode("other", "/other/", 5)
+
+        flat_nodes = list(flatten_nodes([root, other]))
+        self.assertEqual(
+            [(node.title, node.depth, node.position) for node in flat_nodes],
+            [("root", 0, 0), ("first", 1, 0), ("grandchild", 2, 0), ("second", 1, 1), ("other", 0, 1)]
+        )
+        self.assertEqual(flat_nodes[1].parent_id, 1)
+
+    def test_deep_tree(self):
+        root = node = NavigationNode("node", "/", 0)
+        for i in range(sys.getrecursionlimit() + 100):
+            child = NavigationNode("node", "/", i + 1, node.id)
+            node.children = [child]
+            node = child
+        self.assertEqual(len(list(flatten_nodes([root]))), sys.getrecursionlimit() + 101)
+
+
+class CompactNodesTestCase(SimpleTestCase):
+
+    def setUp(self):
+        root = make_node(1, ancestor=True, menu_level=0, is_leaf_node=False)
+        child = make_node(2, root, selected=True, menu_level=1)
+        make_node(3, child, descendant=True, is_leaf_node=True)
+        make_node(4, root, sibling=True)
+        self.nodes = [node.node for node in flatten_nodes([root, make_node(5)])]
+        self.compact = compact_nodes(self.nodes)
+
+    def test_same_output(self):
+        roots = [self.nodes[0], self.nodes[-1]]
+        compact_roots = [self.compact[0], self.compact[-1]]
+        for serializer_class in (NavigationNodeSerializer, FastNavigationNodeSerializer):
+            self.assertEqual(serializer_class(compact_roots, many=True).data,
+                             serializer_class(roots, many=True).data)
+        self.assertEqual(FastFlatNavigationNodeSerializer(list(flatten_nodes(compact_roots)), many=True).data,
+                         FastFlatNavigationNodeSerializer(list(flatten_nodes(roots)), many=True).data)
+
+    def test_links(self):
+        root, child, grandchild, sibling, other = self.compact
+        self.assertEqual(root.children, [child, sibling])
+        self.assertIs(grandchild.parent, child)
+        self.assertIsNone(other.parent)
+        self.assertEqual(grandchild.get_ancestors(), [child, root])
+        self.assertFalse(hasattr(other, "__dict__"))
+
+    def test_attributes(self):
+        root = self.compact[0]
+        self.assertEqual(root.attr, self.nodes[0].attr)
+        self.assertEqual(root.get_attribute("reverse_id"), "node-1")
+        self.assertIsNone(root.attr.get("missing"))
+        with self.assertRaises(KeyError):
+            root.attr["missing"]
+
+        first, second = NavigationNode("first", "/first/", 1), NavigationNode("second", "/second/", 2)
+        first.attr = {"reverse_id": "same", "soft_root": False}
+        second.attr = dict(first.attr)
+        first, second = compact_nodes([first, second])
+        self.assertIs(first.attr, second.attr)
+
+    def test_copy(self):
+        node = copy.copy(self.compact[1])
+        node.selected = False
+        node.children = []
+        self.assertTrue(self.compact[1].selected)
+        self.assertEqual(len(self.compact[1].children), 1)
+        self.assertFalse(hasattr(node, "level"))
+
+    def test_deepcopy(self):
+        root, child, grandchild, sibling, other = copy.deepcopy(self.compact)
+        self.assertEqual(root.children, [child, sibling])
+        self.assertIs(grandchild.parent, child)
+        self.assertIsNot(child, self.compact[1])
+        self.assertIs(child.attr, self.compact[1].attr)
+        child.children.remove(grandchild)
+        self.assertEqual(len(self.compact[1].children), 1)
+
+    def test_copy_nodes(self):
+        for nodes in (self.nodes, self.compact):
+            copies = copy_nodes(nodes)
+            root, child, grandchild, sibling, other = copies
+            self.assertEqual(root.children, [child, sibling])
+            self.assertIs(grandchild.parent, child)
+            root.children.append(other)
+            child.selected = False
+            self.assertEqual(len(nodes[0].children), 2)
+            self.assertTrue(nodes[1].selected)
+
+    def test_subclasses_are_copied(self):
+        class PageNode(NavigationNode):
+            def get_menu_title(self):
+                return "Page"
+
+        parent = NavigationNode("parent", "/", 1)
+        child = PageNode("child", "/child/", 2, 1)
+        child.parent, parent.children = parent, [child]
+        parent, child = compact_nodes([parent, child])
+        self.assertEqual(type(child), PageNode)
+        self.assertEqual(child.get_menu_title(), "Page")
+        self.assertIs(child.parent, parent)
+        self.assertEqual(parent.children, [child])
+
+
+class NodeOverlayTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.root = make_node(1, is_leaf_node=False)
+        self.child = make_node(2, self.root, is_leaf_node=True)
+
+    def test_overlay(self):
+        overlay = NodeOverlay(self.root, selected=True, children=[])
+        self.assertTrue(overlay.selected)
+        self.assertEqual(overlay.children, [])
+        self.assertEqual(overlay.title, "Node 1")
+        self.assertEqual(overlay.attr["reverse_id"], "node-1")
+        self.assertFalse(self.root.selected)
+        self.assertEqual(self.root.children, [self.child])
+
+    def test_hidden(self):
+        overlay = NodeOverlay(self.root, hidden=("children",))
+        self.assertFalse(hasattr(overlay, "children"))
+        self.assertEqual(self.root.children, [self.child])
+
+        expected = FastNavigationNodeSerializer(self.root).data
+        del expected["children"]
+        for serializer_class in (NavigationNodeSerializer, FastNavigationNodeSerializer):
+            self.assertEqual(serializer_class(overlay).data, expected)
+
+
+class FlatLayoutTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def test_flat_layout(self):
+        url = reverse("show-menu-list")
+        data = {"current_page": "/p2/", "extra_inactive": 100}
+        tree = self.client.get(url, data=data, format="json").data
+        flat = self.client.get(url, data=dict(data, layout="flat"), format="json").data
+
+        self.assertEqual([node["title"] for node in flat], ["P1", "P2", "P3", "P9", "P10", "P11", "P4", "P5"])
+        self.assertEqual([node["depth"] for node in flat], [0, 1, 2, 1, 2, 3, 0, 1])
+        self.assertEqual([node["position"] for node in flat], [0, 0, 0, 1, 0, 0, 1, 0])
+        self.assertNotIn("children", flat[0])
+        self.assertEqual(flat[1]["parent_id"], flat[0]["id"])
+        self.assertTrue(flat[1]["selected"])
+
+        node = dict(flat[0], children=tree[0]["children"])
+        del node["depth"], node["position"]
+        self.assertEqual(node, tree[0])
+
+    def test_flat_breadcrumb(self):
+        flat = self.client.get(
+            reverse("show-breadcrumb-list"),
+            data={"current_page": "/p2/p3/", "layout": "flat"},
+            format="json"
+        ).data
+        self.assertEqual([node["depth"] for node in flat], [0, 0, 0])
+        self.assertEqual([node["position"] for node in flat], [0, 1, 2])
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+
+import mock
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from cms.models import ACCESS_PAGE_AND_DESCENDANTS, PagePermission
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+from menus.menu_pool import menu_pool
+
+from djangocms_restapi.menu import cache as menu_cache, engine, permissions
+from djangocms_restapi.menu.cache import get_visibility
+
+from .test_menus import BaseAPITestCase
+
+
+@override_settings(CMS_PERMISSION=True, DJANGOCMS_RESTAPI_MENU_CACHE="default")
+class PermissionClassTestCase(ExtendedMenusFixture, BaseAPITestCase):
+    """
+    P4 and P5 are only visible to the members of the "intranet" group.
+    """
+
+    def setUp(self):
+        super(PermissionClassTestCase, self).setUp()
+        cache.clear()
+        permissions.invalidate()
+        engine.tree_cache.clear()
+
+        self.group = Group.objects.create(name="intranet")
+        PagePermission.objects.create(page=self.get_page("p4").publisher_draft, group=self.group, can_view=True,
+                                      grant_on=ACCESS_PAGE_AND_DESCENDANTS)
+        self.members = []
+        for username in ("first", "second", "other"):
+            user = User.objects.create_user(username, "%s@example.com" % username, username)
+            if username != "other":
+                user.groups.add(self.group)
+                self.members.append(user)
+        self.other = user
+
+    def get_visibility(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return get_visibility(request)
+
+    def get_menu(self, user):
+        self.client.login(username=user.username, password=user.username)
+        response = self.client.get(reverse("show-menu-list"), format="json")
+        self.client.logout()
+        return [node["title"] for node in json.loads(response.content.decode("utf-8"))]
+
+    def test_permission_classes(self):
+        first, second = self.members
+        self.assertEqual(self.get_visibility(first), self.get_visibility(second))
+        self.assertNotEqual(self.get_visibility(first), self.get_visibility(self.other))
+        self.assertTrue(self.get_visibility(first).startswith("authenticated:"))
+
+        with override_settings(CMS_PERMISSION=False):
+            self.assertEqual(self.get_visibility(first), "authenticated")
+
+    def test_visible_pages(self):
+        self.assertEqual(self.get_menu(self.members[0]), ["P1", "P4"])
+        self.assertEqual(self.get_menu(self.members[1]), ["P1", "P4"])
+        self.assertEqual(self.get_menu(self.other), ["P1"])
+
+    def test_responses_are_shared(self):
+        self.get_menu(self.members[0])
+        with mock.patch.object(menu_pool, "_build_nodes", wraps=menu_pool._build_nodes) as build_nodes:
+            self.assertEqual(self.get_menu(self.members[1]), ["P1", "P4"])
+            self.assertFalse(build_nodes.called)
+            self.assertEqual(self.get_menu(self.other), ["P1"])
+            self.assertTrue(build_nodes.called)
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_BACKEND="direct", DJANGOCMS_RESTAPI_MENU_CACHE=None)
+    def test_trees_are_shared(self):
+        with mock.patch.object(menu_pool, "_build_nodes", wraps=menu_pool._build_nodes) as build_nodes:
+            for user in self.members:
+                self.get_menu(user)
+            self.assertEqual(build_nodes.call_count, 1)
+            self.get_menu(self.other)
+            self.assertEqual(build_nodes.call_count, 2)
+
+    def test_group_change_invalidates(self):
+        self.assertEqual(self.get_menu(self.other), ["P1"])
+        self.other.groups.add(self.group)
+        self.assertEqual(self.get_visibility(self.other), self.get_visibility(self.members[0]))
+        self.assertEqual(self.get_menu(self.other), ["P1", "P4"])
+
+    def test_group_change_keeps_shared_caches(self):
+        self.client.get(reverse("show-menu-list"), format="json")
+        self.get_menu(self.members[0])
+        generation = menu_cache.get_generation(cache)
+        with mock.patch.object(menu_pool, "clear") as clear:
+            self.other.groups.add(self.group)
+        self.assertFalse(clear.called)
+        self.assertEqual(menu_cache.get_generation(cache), generation)
+        with mock.patch.object(menu_pool, "_build_nodes") as build_nodes:
+            self.assertEqual(self.get_menu(self.other), ["P1", "P4"])
+        self.assertFalse(build_nodes.called)
+
+    def test_unrelated_group_change(self):
+        self.get_menu(self.other)
+        group = Group.objects.create(name="unrelated")
+        with mock.patch.object(permissions, "invalidate") as invalidate:
+            self.other.groups.add(group)
+            group.user_set.remove(self.other)
+        self.assertFalse(invalidate.called)
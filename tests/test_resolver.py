@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.test.utils import override_settings
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from djangocms_restapi.menu.resolver import page_cache, resolve_page
+
+from .test_menus import BaseAPITestCase
+
+
+@override_settings(DJANGOCMS_RESTAPI_PAGE_RESOLVER=True, DJANGOCMS_RESTAPI_MENU_CONDITIONAL_GET=False)
+class PageResolverTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def setUp(self):
+        super(PageResolverTestCase, self).setUp()
+        page_cache.clear()
+        self.url = reverse("show-breadcrumb-list")
+
+    def get_breadcrumb(self, current_page):
+        return self.client.get(self.url, data={"current_page": current_page}, format="json").data
+
+    def count_queries(self, current_page):
+        with CaptureQueriesContext(connection) as context:
+            data = self.get_breadcrumb(current_page)
+        return data, len(context.captured_queries)
+
+    def test_resolved_pages_are_cached(self):
+        with override_settings(DJANGOCMS_RESTAPI_PAGE_RESOLVER=False):
+            expected, uncached_queries = self.count_queries("/p2/p3/")
+
+        self.get_breadcrumb("/p2/p3/")
+        hits = page_cache.hits
+        data, queries = self.count_queries("/p2/p3/")
+        self.assertEqual(data, expected)
+        self.assertEqual(page_cache.hits, hits + 1)
+        self.assertLess(queries, uncached_queries)
+
+    def test_publish_invalidates(self):
+        self.get_breadcrumb("/p2/p3/")
+        self.assertEqual(len(page_cache), 1)
+        self.get_page("p2").publisher_public.publish("en")
+        self.assertEqual(len(page_cache), 0)
+
+    def test_pages_are_not_shared(self):
+        def resolve():
+            request = RequestFactory().get("/p2/p3/")
+            request.user = AnonymousUser()
+            return resolve_page(request)
+
+        page = resolve()
+        page.title_cache = {"en": None}
+        cached = resolve()
+        self.assertEqual(cached, page)
+        self.assertIsNot(cached, page)
+        self.assertFalse(hasattr(cached, "title_cache"))
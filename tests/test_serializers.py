@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from django.core.urlresolvers import reverse
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+from menus.base import NavigationNode
+
+from djangocms_restapi.menu.nodes import flatten_nodes
+from djangocms_restapi.menu.serializers import (
+    FastFlatNavigationNodeSerializer, FastNavigationNodeSerializer, FlatNavigationNodeSerializer,
+    NavigationNodeSerializer, StreamingNavigationNodeSerializer, parse_fields, select_fields
+)
+from djangocms_restapi.menu.renderers import MenuJSONRenderer
+
+from .test_menus import BaseAPITestCase
+
+
+def make_node(id, parent=None, **kwargs):
+    attr = {
+        "auth_required": False,
+        "is_home": parent is None,
+        "redirect_url": None,
+        "reverse_id": "node-%s" % id,
+        "soft_root": 0,
+        "visible_for_anonymous": True,
+        "visible_for_authenticated": "1",
+    }
+    node = NavigationNode("Node %s" % id, "/node-%s/" % id, id, getattr(parent, "id", None), attr=attr)
+    node.namespace = "CMSMenu"
+    node.parent_namespace = "CMSMenu" if parent else None
+    node.parent = parent
+    node.selected = node.ancestor = node.descendant = node.sibling = False
+    for name, value in kwargs.items():
+        setattr(node, name, value)
+    if parent is not None:
+        parent.children.append(node)
+    return node
+
+
+class FastSerializerTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.root = make_node(1, ancestor=True, menu_level=0, is_leaf_node=False)
+        child = make_node(2, self.root, selected=True, menu_level=1)
+        make_node(3, child, descendant=1, is_leaf_node=True)
+        make_node(4, self.root, sibling=True)
+        self.other = make_node(5)
+        del self.other.children
+
+    def test_same_output(self):
+        nodes = [self.root, self.other]
+        self.assertEqual(
+            FastNavigationNodeSerializer(nodes, many=True).data,
+            NavigationNodeSerializer(nodes, many=True).data
+        )
+        self.assertEqual(
+            FastNavigationNodeSerializer(self.root).data,
+            NavigationNodeSerializer(self.root).data
+        )
+
+    def test_same_flat_output(self):
+        nodes = list(flatten_nodes([self.root, self.other]))
+        self.assertEqual(
+            FastFlatNavigationNodeSerializer(nodes, many=True).data,
+            FlatNavigationNodeSerializer(nodes, many=True).data
+        )
+
+    def test_sparse_fields(self):
+        nodes = [self.root, self.other]
+        context = {"fields": {"id", "title", "attrs.is_home"}, "exclude": {"title"}, "max_depth": 2}
+        data = FastNavigationNodeSerializer(nodes, many=True, context=context).data
+        self.assertEqual(data, NavigationNodeSerializer(nodes, many=True, context=context).data)
+        self.assertEqual(list(data[0]), ["id", "attrs", "children"])
+        self.assertEqual(data[0]["attrs"], {"is_home": True})
+        self.assertEqual(list(data[0]["children"][0]), ["id", "attrs"])
+
+    def test_sparse_flat_fields(self):
+        context = {"fields": {"id"}, "exclude": {"position"}}
+        nodes = list(flatten_nodes([self.root, self.other], max_depth=1))
+        data = FastFlatNavigationNodeSerializer(nodes, many=True, context=context).data
+        self.assertEqual(data, FlatNavigationNodeSerializer(nodes, many=True, context=context).data)
+        self.assertEqual(data, [{"id": 1, "depth": 0}, {"id": 5, "depth": 0}])
+
+    def test_select_fields(self):
+        self.assertEqual(parse_fields(" id, title,,"), {"id", "title"})
+        self.assertIsNone(parse_fields(""))
+        names = ["id", "title", "attrs", "children"]
+        self.assertEqual(select_fields(names, {"id", "attrs.is_home"}), ["id", "attrs"])
+        self.assertEqual(select_fields(names, {"id"}, {"children"}, keep=("children",)), ["id"])
+        self.assertEqual(select_fields(["is_home", "soft_root"], {"id", "attrs"}, prefix="attrs."),
+                         ["is_home", "soft_root"])
+        self.assertEqual(select_fields(["is_home", "soft_root"], None, {"attrs.soft_root"}, prefix="attrs."),
+                         ["is_home"])
+
+    def test_missing_attribute(self):
+        del self.other.selected
+        with self.assertRaises(AttributeError):
+            FastNavigationNodeSerializer(self.other).data
+
+
+class FastSerializerViewTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def test_same_output(self):
+        for url_name in ("show-menu-list", "show-submenu-list", "show-breadcrumb-list"):
+            for layout in ("tree", "flat"):
+                data = {"current_page": "/p2/p3/", "layout": layout}
+                expected = self.client.get(reverse(url_name), data=data, format="json").content
+                with override_settings(DJANGOCMS_RESTAPI_MENU_SERIALIZER="fast"):
+                    content = self.client.get(reverse(url_name), data=data, format="json").content
+                self.assertEqual(content, expected)
+
+    def test_same_sparse_output(self):
+        data = {"current_page": "/p2/p3/", "extra_inactive": 100, "fields": "id,title,url,selected", "max_depth": 2}
+        expected = self.client.get(reverse("show-menu-list"), data=data, format="json")
+        with override_settings(DJANGOCMS_RESTAPI_MENU_SERIALIZER="fast", DJANGOCMS_RESTAPI_MENU_FRAGMENTS=True):
+            response = self.client.get(reverse("show-menu-list"), data=data, format="json")
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(list(response.data[0]), ["id", "title", "url", "selected", "children"])
+        self.assertTrue(response.data[0]["children"])
+        self.assertNotIn("children", response.data[0]["children"][0])
+
+
+class StreamingTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def test_same_output(self):
+        for url_name in ("show-menu-list", "show-menu-below-id-list", "show-submenu-list", "show-breadcrumb-list"):
+            for layout in ("tree", "flat"):
+                for accept in ("application/json", "application/json; indent=4"):
+                    data = {"current_page": "/p2/p3/", "extra_inactive": 100, "layout": layout}
+                    expected = self.client.get(reverse(url_name), data=data, HTTP_ACCEPT=accept)
+                    response = self.client.get(reverse(url_name), data=dict(data, stream="1"), HTTP_ACCEPT=accept)
+                    self.assertTrue(response.streaming)
+                    self.assertEqual(response["Content-Type"], expected["Content-Type"])
+                    self.assertEqual(b"".join(response.streaming_content), expected.content)
+
+    def test_chunks(self):
+        nodes = [make_node(1)]
+        for i in range(2, 50):
+            make_node(i, nodes[0])
+        data = StreamingNavigationNodeSerializer(nodes, many=True).data
+        chunks = list(MenuJSONRenderer().render_chunks(data, chunk_size=1024))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(
+            b"".join(chunks), MenuJSONRenderer().render(FastNavigationNodeSerializer(nodes, many=True).data)
+        )
+
+    def test_empty(self):
+        self.assertEqual(list(MenuJSONRenderer().render_chunks(StreamingNavigationNodeSerializer([], many=True).data)),
+                         [b"[]"])
+
+    def test_batch(self):
+        data = {"current_page": "/p2/p3/", "menus": "menu:show-menu"}
+        expected = self.client.get(reverse("batch-list"), data=data, format="json")
+        response = self.client.get(reverse("batch-list"), data=dict(data, stream="1", **{"menu.stream": "1"}),
+                                   format="json")
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.content, expected.content)
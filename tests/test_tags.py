@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from django.test import SimpleTestCase
+
+from djangocms_restapi.menu.tags import format_argument, get_tag_template, template_cache
+
+
+class TagTemplateCacheTestCase(SimpleTestCase):
+
+    def setUp(self):
+        template_cache.clear()
+
+    def test_format_argument(self):
+        self.assertEqual(format_argument(None), "None")
+        self.assertEqual(format_argument(10), "10")
+        self.assertEqual(format_argument('a"b'), '"a\\"b"')
+        self.assertEqual(format_argument("{% now %}"), '"% now %"')
+
+    def test_templates_are_cached_by_arguments(self):
+        hits = template_cache.hits
+        template = get_tag_template("show_breadcrumb", (0,))
+        self.assertIs(get_tag_template("show_breadcrumb", (0,)), template)
+        self.assertIsNot(get_tag_template("show_breadcrumb", (1,)), template)
+        self.assertEqual(template_cache.hits, hits + 1)
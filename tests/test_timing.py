@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import re
+
+import mock
+
+from django.core.urlresolvers import reverse
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from .test_menus import BaseAPITestCase
+
+
+@override_settings(DJANGOCMS_RESTAPI_MENU_TIMING=True)
+class TimingTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def test_server_timing(self):
+        with mock.patch("djangocms_restapi.menu.timing.logger") as logger:
+            response = self.client.get(reverse("show-menu-list"), data={"current_page": "/p2/"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        names = [entry.split(";")[0] for entry in response["Server-Timing"].split(", ")]
+        self.assertEqual(names, ["sql", "page", "menu", "serialize", "render", "total"])
+        queries = int(re.search(r'desc="(\d+) queries"', response["Server-Timing"]).group(1))
+        self.assertGreater(queries, 0)
+
+        metrics = logger.info.call_args[1]["extra"]["menu_timing"]
+        self.assertEqual(metrics["queries"], queries)
+
+    def test_query_count(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("show-menu-list"), data={"current_page": "/p2/"}, format="json")
+        queries = int(re.search(r'desc="(\d+) queries"', response["Server-Timing"]).group(1))
+        self.assertEqual(queries, len(context.captured_queries))
+        # The cursors are only wrapped during the request.
+        self.assertNotIn("make_cursor", vars(connections["default"]))
+
+    def test_failing_request(self):
+        for target in ("djangocms_restapi.menu.views.ShowMenuViewSet.get_nodes",
+                       "djangocms_restapi.menu.renderers.MenuJSONRenderer.render"):
+            with mock.patch(target, side_effect=RuntimeError):
+                with self.assertRaises(RuntimeError):
+                    self.client.get(reverse("show-menu-list"), format="json")
+            self.assertNotIn("make_cursor", vars(connections["default"]))
+            self.assertNotIn("make_debug_cursor", vars(connections["default"]))
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_CONDITIONAL_GET=True)
+    def test_not_modified(self):
+        etag = self.client.get(reverse("show-menu-list"), format="json")["ETag"]
+        response = self.client.get(reverse("show-menu-list"), format="json", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertTrue(response["Server-Timing"].startswith('sql;dur='))
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_TIMING=False)
+    def test_disabled(self):
+        response = self.client.get(reverse("show-menu-list"), format="json")
+        self.assertNotIn("Server-Timing", response)
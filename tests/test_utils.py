@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from django.test import SimpleTestCase
+
+from djangocms_restapi.utils import LRUCache, get_integer
+
+
+class LRUCacheTestCase(SimpleTestCase):
+
+    def test_get_counts_hits_and_misses(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.info(), {"hits": 1, "misses": 1, "maxsize": 2, "currsize": 1})
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_get_or_set(self):
+        cache = LRUCache(maxsize=2)
+        calls = []
+        factory = lambda: calls.append(1) or "value"
+        self.assertEqual(cache.get_or_set("a", factory), "value")
+        self.assertEqual(cache.get_or_set("a", factory), "value")
+        self.assertEqual(len(calls), 1)
+
+
+class GetIntegerTestCase(SimpleTestCase):
+
+    def test_get_integer(self):
+        self.assertEqual(get_integer({"level": "2"}, "level", 0), 2)
+        self.assertEqual(get_integer({"level": "two"}, "level", 0), 0)
+        self.assertEqual(get_integer({}, "level", None), None)
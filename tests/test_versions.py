@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+import copy
+import json
+
+import mock
+
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from cms.api import create_page
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from djangocms_restapi.menu import cache as menu_cache
+from djangocms_restapi.menu import versions
+from djangocms_restapi.menu.nodes import flatten_nodes
+from djangocms_restapi.menu.serializers import FastFlatNavigationNodeSerializer, FastNavigationNodeSerializer
+
+from .test_menus import BaseAPITestCase
+from .test_serializers import make_node
+
+
+def get_data(response):
+    return json.loads(response.content.decode("utf-8"))
+
+
+class DiffTestCase(SimpleTestCase):
+
+    def setUp(self):
+        root = make_node(1)
+        child = make_node(2, root)
+        make_node(3, child)
+        make_node(4, root)
+        self.nodes = [root, make_node(5)]
+        self.old = FastNavigationNodeSerializer(self.nodes, many=True).data
+
+    def test_round_trip(self):
+        new = copy.deepcopy(self.old)
+        new[0]["children"][0]["title"] = "Changed"
+        new[0]["children"].pop()
+        new[1]["children"].append(copy.deepcopy(new[0]["children"][0]["children"][0]))
+        new[1]["children"][0]["id"] = 6
+        new.reverse()
+
+        ops = versions.diff(self.old, new)
+        self.assertEqual(sorted((op["op"], op["path"]) for op in ops), [
+            ("add", "/CMSMenu:6"), ("remove", "/CMSMenu:4"), ("replace", "/CMSMenu:1"), ("replace", "/CMSMenu:2"),
+            ("replace", "/CMSMenu:5"),
+        ])
+        self.assertEqual(versions.apply(self.old, ops), new)
+
+    def test_unchanged(self):
+        self.assertEqual(versions.diff(self.old, copy.deepcopy(self.old)), [])
+        self.assertEqual(versions.get_version(self.old), versions.get_version(copy.deepcopy(self.old)))
+
+    def test_flat(self):
+        old = FastFlatNavigationNodeSerializer(list(flatten_nodes(self.nodes)), many=True).data
+        new = copy.deepcopy(old)
+        new[2]["title"] = "Changed"
+        self.assertEqual(versions.apply(old, versions.diff(old, new)), new)
+
+    def test_without_ids(self):
+        self.assertIsNone(versions.diff([{"title": "No id"}], self.old))
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_CACHE="default")
+    def test_stored_once(self):
+        cache.clear()
+        shared = menu_cache.get_cache()
+        with mock.patch.object(shared, "add", wraps=shared.add) as add:
+            version = versions.save(self.old)
+            self.assertEqual(versions.save(copy.deepcopy(self.old)), version)
+        self.assertEqual(add.call_count, 1)
+        self.assertEqual(versions.load(version), self.old)
+
+
+@override_settings(DJANGOCMS_RESTAPI_MENU_VERSIONS=True)
+class VersionsTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def setUp(self):
+        super(VersionsTestCase, self).setUp()
+        versions.version_cache.clear()
+        cache.clear()
+        self.url = reverse("show-menu-list")
+        self.params = {"current_page": "/p2/", "extra_inactive": 100}
+
+    def test_since(self):
+        response = self.client.get(self.url, data=self.params, format="json")
+        version = response["X-Menu-Version"]
+        old = get_data(response)
+
+        response = self.client.get(self.url, data=dict(self.params, since=version), format="json")
+        self.assertEqual(get_data(response), {"version": version, "since": version, "patch": []})
+
+        page = create_page("P12", "nav_playground.html", "en", in_navigation=True, published=False)
+        page.publish("en")
+        full = self.client.get(self.url, data=self.params, format="json")
+        self.assertNotEqual(full["X-Menu-Version"], version)
+
+        response = self.client.get(self.url, data=dict(self.params, since=version), format="json")
+        data = get_data(response)
+        self.assertEqual(data["version"], full["X-Menu-Version"])
+        self.assertEqual([op["op"] for op in data["patch"]], ["add"])
+        self.assertEqual(versions.apply(old, data["patch"]), get_data(full))
+
+    def test_unknown_version(self):
+        full = self.client.get(self.url, data=self.params, format="json")
+        response = self.client.get(self.url, data=dict(self.params, since="unknown"), format="json")
+        self.assertEqual(get_data(response), get_data(full))
+        self.assertEqual(response["X-Menu-Version"], full["X-Menu-Version"])
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_CACHE="default")
+    def test_cached_response(self):
+        response = self.client.get(self.url, data=self.params, format="json")
+        cached = self.client.get(self.url, data=self.params, format="json")
+        self.assertEqual(cached["X-Menu-Version"], response["X-Menu-Version"])
+        response = self.client.get(self.url, data=dict(self.params, since=cached["X-Menu-Version"]), format="json")
+        self.assertEqual(get_data(response)["patch"], [])
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_VERSIONS=False)
+    def test_disabled(self):
+        response = self.client.get(self.url, data=self.params, format="json")
+        self.assertNotIn("X-Menu-Version", response)
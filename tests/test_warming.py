@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, unicode_literals
+
+from unittest import skipIf
+
+import mock
+
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.core.urlresolvers import reverse
+from django.db import transaction
+from django.test.utils import override_settings
+
+from cms.test_utils.fixtures.menus import ExtendedMenusFixture
+
+from djangocms_restapi.menu import warming
+
+from .test_menus import BaseAPITestCase
+
+
+@override_settings(DJANGOCMS_RESTAPI_MENU_CACHE="default", DJANGOCMS_RESTAPI_MENU_CACHE_WARMING=True,
+                   DJANGOCMS_RESTAPI_MENU_CACHE_WARMING_SYNC=True)
+class MenuCacheWarmingTestCase(ExtendedMenusFixture, BaseAPITestCase):
+
+    def setUp(self):
+        super(MenuCacheWarmingTestCase, self).setUp()
+        cache.clear()
+
+    def test_page_urls(self):
+        page = self.get_page("p3")
+        self.assertEqual(warming.get_page_urls(page.pk, 1), [("en", "/"), ("en", "/p2/"), ("en", "/p2/p3/")])
+        page = self.get_page("p2")
+        self.assertEqual(warming.get_page_urls(page.pk, 1), [("en", "/"), ("en", "/p2/"), ("en", "/p9/")])
+
+    def test_publish_warms_cache(self):
+        with mock.patch.object(warming, "warm_menu", wraps=warming.warm_menu) as warm_menu:
+            self.get_page("p9").publisher_draft.publish("en")
+        self.assertEqual(
+            sorted(call[0][::2] for call in warm_menu.call_args_list),
+            sorted((endpoint, url) for endpoint in ("show-menu", "show-breadcrumb") for url in ("/", "/p2/", "/p9/"))
+        )
+
+        # Only the current page is resolved, the menu isn't built again.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("show-menu-list"), data={"current_page": "/p9/"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+    def test_disabled_without_cache(self):
+        with override_settings(DJANGOCMS_RESTAPI_MENU_CACHE=None), \
+                mock.patch.object(warming, "queue_page") as queue_page:
+            self.get_page("p9").publisher_draft.publish("en")
+        self.assertFalse(queue_page.called)
+
+    @override_settings(DJANGOCMS_RESTAPI_MENU_CACHE_WARMING_SYNC=False)
+    def test_queued_once(self):
+        self.addCleanup(warming._pending.clear)
+        with mock.patch.object(warming, "get_pool") as get_pool:
+            warming.queue_page(1, 1)
+            warming.queue_page(1, 1)
+            warming.queue_page(2, 1)
+        self.assertEqual(get_pool.return_value.apply_async.call_count, 2)
+
+    @skipIf(hasattr(transaction, "on_commit"), "The publish is queued by transaction.on_commit.")
+    @override_settings(DJANGOCMS_RESTAPI_MENU_CACHE_WARMING_SYNC=False)
+    def test_queued_after_commit(self):
+        self.addCleanup(warming._pending.clear)
+        page = self.get_page("p9")
+        with mock.patch.object(warming, "get_pool") as get_pool:
+            with transaction.atomic():
+                page.publisher_draft.publish("en")
+                self.assertFalse(get_pool.called)
+            self.assertFalse(get_pool.called)
+            request_finished.send(sender=self.__class__)
+        get_pool.return_value.apply_async.assert_called_once_with(warming.warm_page_in_thread, (page.pk, 1))